@@ -5,25 +5,48 @@ Modules:
 - console: interactive console for search results
 """
 
-from .display import display_all_results_table, display_all_search_result_items
-from .console import SearchResultConsole
-from .utils import convert_rmb_to_jpy, convert_jpy_to_rmb, get_product_price_in_jpy
-from .filters import (
-    filter_products_by_size,
-    filter_products_by_inventory,
-    filter_products_by_delivery,
-    filter_products_by_shipping_fee,
-    filter_products_by_weight,
-    filter_products_by_jpy_price,
-    filter_products_by_categories,
-    apply_product_filters,
-    collect_categories_from_products,
-)
-from .api_search import (
-    search_products,
-    get_product_detail,
-    get_image_id,
-)
+import importlib
+
+# Public name -> submodule. Submodules are imported on first attribute access, so
+# `import rakumart.cli` (every CLI run) does not pay for display/console/models
+# or the HTTP stack before the chosen command needs them.
+_EXPORTS = {
+    "display_all_results_table": "display",
+    "display_all_search_result_items": "display",
+    "SearchResultConsole": "console",
+    "convert_rmb_to_jpy": "utils",
+    "convert_jpy_to_rmb": "utils",
+    "get_product_price_in_jpy": "utils",
+    "filter_products_by_size": "filters",
+    "filter_products_by_inventory": "filters",
+    "filter_products_by_delivery": "filters",
+    "filter_products_by_shipping_fee": "filters",
+    "filter_products_by_weight": "filters",
+    "filter_products_by_jpy_price": "filters",
+    "filter_products_by_categories": "filters",
+    "apply_product_filters": "filters",
+    "collect_categories_from_products": "filters",
+    "count_categories_from_products": "filters",
+    "search_products": "api_search",
+    "iter_search_products": "api_search",
+    "get_product_detail": "api_search",
+    "get_product_details_bulk": "api_search",
+    "get_image_id": "api_search",
+    "get_image_ids_bulk": "api_search",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
 
 __all__ = [
     "display_all_results_table",
@@ -41,9 +64,13 @@ __all__ = [
     "filter_products_by_categories",
     "apply_product_filters",
     "collect_categories_from_products",
+    "count_categories_from_products",
     "search_products",
+    "iter_search_products",
     "get_product_detail",
+    "get_product_details_bulk",
     "get_image_id",
+    "get_image_ids_bulk",
 ]
 
 
@@ -0,0 +1,98 @@
+"""asyncio front-ends for the API helpers.
+
+The helpers run in worker threads via asyncio.to_thread and share the pooled
+session from .http, so fan-out from async code is concurrent without a second
+HTTP stack:
+
+    import asyncio
+    from rakumart.aio import a_get_product_detail
+
+    async def main(ids):
+        return await asyncio.gather(*(a_get_product_detail(i) for i in ids))
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from .api_search import search_products, get_product_detail, get_image_id
+from .meta import get_logistics, get_tags
+from .orders import (
+    cancel_order, cancel_porder, create_order, create_porder, get_logistics_track,
+    get_order_detail, get_order_list, get_porder_detail, get_porder_list, get_stock_list,
+    update_order_status, update_porder_status,
+)
+
+
+async def a_search_products(keyword: str, **kwargs: Any) -> List[dict]:
+    return await asyncio.to_thread(search_products, keyword, **kwargs)
+
+
+async def a_get_product_detail(goods_id: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_product_detail, goods_id, **kwargs)
+
+
+async def a_get_image_id(image_base64: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_image_id, image_base64, **kwargs)
+
+
+async def a_get_order_list(**kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_order_list, **kwargs)
+
+
+async def a_get_order_detail(order_sn: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_order_detail, order_sn, **kwargs)
+
+
+async def a_get_porder_list(**kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_porder_list, **kwargs)
+
+
+async def a_get_porder_detail(porder_sn: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_porder_detail, porder_sn, **kwargs)
+
+
+async def a_get_stock_list(**kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_stock_list, **kwargs)
+
+
+async def a_get_logistics_track(express_no: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_logistics_track, express_no, **kwargs)
+
+
+async def a_get_logistics(**kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_logistics, **kwargs)
+
+
+async def a_get_tags(**kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(get_tags, **kwargs)
+
+
+async def a_create_order(purchase_order: str, status: str, goods: List[dict], **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(create_order, purchase_order, status, goods, **kwargs)
+
+
+async def a_update_order_status(order_sn: str, status: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(update_order_status, order_sn, status, **kwargs)
+
+
+async def a_cancel_order(order_sn: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(cancel_order, order_sn, **kwargs)
+
+
+async def a_create_porder(status: str, logistics_id: str, porder_detail: List[dict], **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(create_porder, status, logistics_id, porder_detail, **kwargs)
+
+
+async def a_update_porder_status(porder_sn: str, status: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(update_porder_status, porder_sn, status, **kwargs)
+
+
+async def a_cancel_porder(porder_sn: str, **kwargs: Any) -> Optional[dict]:
+    return await asyncio.to_thread(cancel_porder, porder_sn, **kwargs)
+
+
+async def a_get_product_details(goods_ids: List[str], **kwargs: Any) -> Dict[str, Optional[dict]]:
+    """Fetch many details concurrently; returns {goodsId: detail or None} in input order."""
+    unique = list(dict.fromkeys(str(g) for g in goods_ids))
+    details = await asyncio.gather(*(a_get_product_detail(g, **kwargs) for g in unique))
+    return dict(zip(unique, details))
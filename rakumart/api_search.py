@@ -1,10 +1,59 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator, TYPE_CHECKING
+from collections import OrderedDict
+import copy
 import time
-import json
-import requests
+import threading
 from .sign import md5_sign
-from .http import safe_post_json
-from .config import APP_KEY, APP_SECRET, API_URL, DETAIL_API_URL, IMAGE_ID_API_URL
+from .cache import disk_clear, disk_get, disk_put
+from .http import api_call, api_result, iter_api_items, map_concurrent, can_stream_json
+from .config import APP_KEY, API_URL, DETAIL_API_URL, IMAGE_ID_API_URL
+from .filters import apply_product_filters
+
+if TYPE_CHECKING:  # requests is imported lazily by .http
+    import requests
+
+
+# Cache of raw detail payloads keyed by (goodsId, shopType, endpoint, app_key);
+# repeated searches re-enrich the same goods, so hits skip the network entirely.
+# Entries are kept in process (least recently used dropped past _DETAIL_CACHE_MAX)
+# and on disk, so back-to-back CLI runs share them too. Callers always get a copy.
+_DETAIL_TTL = 600
+_DETAIL_CACHE_MAX = 512
+_DETAIL_CACHE: "OrderedDict[Tuple[str, str, str, str], Tuple[float, dict]]" = OrderedDict()
+_DETAIL_CACHE_LOCK = threading.Lock()
+_DETAIL_DISK_NAMESPACE = "detail"
+
+
+def clear_detail_cache() -> None:
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE.clear()
+    disk_clear(_DETAIL_DISK_NAMESPACE)
+
+
+def _detail_cache_get(key: Tuple[str, str, str, str]) -> Optional[dict]:
+    with _DETAIL_CACHE_LOCK:
+        cached = _DETAIL_CACHE.get(key)
+        if cached is not None and time.time() - cached[0] < _DETAIL_TTL:
+            _DETAIL_CACHE.move_to_end(key)
+            return copy.deepcopy(cached[1])
+    detail = disk_get(_DETAIL_DISK_NAMESPACE, key, _DETAIL_TTL)
+    if isinstance(detail, dict):
+        _detail_cache_put(key, detail, persist=False)
+        return detail
+    return None
+
+
+def _detail_cache_put(key: Tuple[str, str, str, str], detail: dict, persist: bool = True) -> None:
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE[key] = (time.time(), copy.deepcopy(detail))
+        _DETAIL_CACHE.move_to_end(key)
+        while len(_DETAIL_CACHE) > _DETAIL_CACHE_MAX:
+            _DETAIL_CACHE.popitem(last=False)
+    if persist:
+        disk_put(_DETAIL_DISK_NAMESPACE, key, detail)
+
+
+_MISSING = object()
 
 
 def generate_sign(app_key: str, app_secret: str, timestamp: str) -> str:
@@ -12,44 +61,27 @@ def generate_sign(app_key: str, app_secret: str, timestamp: str) -> str:
     return md5_sign(app_key, app_secret, timestamp)
 
 
-def search_products(
+def _search_fields(
     keyword: str,
-    page: int = 1,
-    page_size: int = 20,
-    shop_type: str = "1688",
-    price_min: Optional[str] = None,
-    price_max: Optional[str] = None,
-    order_key: Optional[str] = None,
-    order_value: Optional[str] = None,
-    categories: Optional[List[str]] = None,
-    subcategories: Optional[List[str]] = None,
-    sub_subcategories: Optional[List[str]] = None,
-    max_length: Optional[float] = None,
-    max_width: Optional[float] = None,
-    max_height: Optional[float] = None,
-    max_weight: Optional[float] = None,
-    jpy_price_min: Optional[float] = None,
-    jpy_price_max: Optional[float] = None,
-    exchange_rate: float = 20.0,
-    strict_mode: bool = False,
-    min_inventory: Optional[int] = None,
-    max_delivery_days: Optional[int] = None,
-    max_shipping_fee: Optional[float] = None,
-    request_timeout_seconds: int = 15,
-    app_key: Optional[str] = None,
-    app_secret: Optional[str] = None,
-    api_url: Optional[str] = None,
-    apply_filters_fn=None,
-) -> List[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp) if resolved_app_key and resolved_app_secret else ""
+    page: int,
+    page_size: int,
+    shop_type: str,
+    price_min: Optional[str],
+    price_max: Optional[str],
+    order_key: Optional[str],
+    order_value: Optional[str],
+    categories: Optional[List[str]],
+    subcategories: Optional[List[str]],
+    sub_subcategories: Optional[List[str]],
+    max_length: Optional[float],
+    max_width: Optional[float],
+    max_height: Optional[float],
+    min_inventory: Optional[int],
+    max_delivery_days: Optional[int],
+    max_shipping_fee: Optional[float],
+) -> Dict[str, Any]:
+    """Unsigned search form fields; api_call/iter_api_items prepend app_key/timestamp/sign."""
     payload: Dict[str, Any] = {
-        "app_key": resolved_app_key,
-        "timestamp": timestamp,
-        "sign": sign,
         "keywords": keyword,
         "shop_type": shop_type,
         "page": str(page),
@@ -85,23 +117,66 @@ def search_products(
         payload["max_delivery_days"] = str(max_delivery_days)
     if max_shipping_fee is not None:
         payload["max_shipping_fee"] = str(max_shipping_fee)
+    return payload
 
-    data = safe_post_json(resolved_api_url, data=payload, timeout=request_timeout_seconds)
-    if data is None:
-        return []
 
-    if not data.get("success", False):
-        print(" API request failed:", data)
-        return []
+def search_products(
+    keyword: str,
+    page: int = 1,
+    page_size: int = 20,
+    shop_type: str = "1688",
+    price_min: Optional[str] = None,
+    price_max: Optional[str] = None,
+    order_key: Optional[str] = None,
+    order_value: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    subcategories: Optional[List[str]] = None,
+    sub_subcategories: Optional[List[str]] = None,
+    max_length: Optional[float] = None,
+    max_width: Optional[float] = None,
+    max_height: Optional[float] = None,
+    max_weight: Optional[float] = None,
+    jpy_price_min: Optional[float] = None,
+    jpy_price_max: Optional[float] = None,
+    exchange_rate: float = 20.0,
+    strict_mode: bool = False,
+    min_inventory: Optional[int] = None,
+    max_delivery_days: Optional[int] = None,
+    max_shipping_fee: Optional[float] = None,
+    request_timeout_seconds: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    api_url: Optional[str] = None,
+    apply_filters_fn=None,
+    session: Optional["requests.Session"] = None,
+    cache_ttl: float = 0,
+) -> List[dict]:
+    """
+    Search one page of products. With cache_ttl > 0 an identical search (same
+    fields and credentials) within that many seconds reuses the previous response.
+    """
+    fields = _search_fields(
+        keyword, page, page_size, shop_type, price_min, price_max, order_key, order_value,
+        categories, subcategories, sub_subcategories, max_length, max_width, max_height,
+        min_inventory, max_delivery_days, max_shipping_fee,
+    )
 
-    try:
-        products = data["data"]["result"]["result"]
-    except (KeyError, TypeError):
-        print(" Unexpected API response structure:")
-        print(json.dumps(data, ensure_ascii=False, indent=2))
+    data = api_call(
+        api_url or API_URL,
+        fields,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+    products = api_result(data, "API", "data", "result", "result", default=_MISSING)
+    if products is _MISSING:
         return []
 
     if apply_filters_fn:
+        # The built-in filter can skip what the API already applied; custom callbacks get every option
+        extra = {"api_filtered": True} if apply_filters_fn is apply_product_filters else {}
         products = apply_filters_fn(
             products,
             categories=categories,
@@ -118,11 +193,68 @@ def search_products(
             min_inventory=min_inventory,
             max_delivery_days=max_delivery_days,
             max_shipping_fee=max_shipping_fee,
+            **extra,
         )
 
     return products
 
 
+def iter_search_products(
+    keyword: str,
+    page: int = 1,
+    page_size: int = 20,
+    shop_type: str = "1688",
+    price_min: Optional[str] = None,
+    price_max: Optional[str] = None,
+    order_key: Optional[str] = None,
+    order_value: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    subcategories: Optional[List[str]] = None,
+    sub_subcategories: Optional[List[str]] = None,
+    max_length: Optional[float] = None,
+    max_width: Optional[float] = None,
+    max_height: Optional[float] = None,
+    min_inventory: Optional[int] = None,
+    max_delivery_days: Optional[int] = None,
+    max_shipping_fee: Optional[float] = None,
+    request_timeout_seconds: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
+) -> Iterator[dict]:
+    """
+    Yield search results one by one. With ijson installed, items are parsed from
+    the response as it arrives instead of materialising the whole payload first;
+    otherwise this falls back to search_products(). No client-side filtering.
+    """
+    if not can_stream_json():
+        yield from search_products(
+            keyword, page=page, page_size=page_size, shop_type=shop_type,
+            price_min=price_min, price_max=price_max, order_key=order_key, order_value=order_value,
+            categories=categories, subcategories=subcategories, sub_subcategories=sub_subcategories,
+            max_length=max_length, max_width=max_width, max_height=max_height,
+            min_inventory=min_inventory, max_delivery_days=max_delivery_days, max_shipping_fee=max_shipping_fee,
+            request_timeout_seconds=request_timeout_seconds, app_key=app_key, app_secret=app_secret,
+            api_url=api_url, session=session,
+        )
+        return
+    fields = _search_fields(
+        keyword, page, page_size, shop_type, price_min, price_max, order_key, order_value,
+        categories, subcategories, sub_subcategories, max_length, max_width, max_height,
+        min_inventory, max_delivery_days, max_shipping_fee,
+    )
+    yield from iter_api_items(
+        api_url or API_URL,
+        "data.result.result",
+        fields,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
+
+
 def _normalize_detail_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Best-effort normalization of product detail data shape per API spec."""
     out: Dict[str, Any] = {}
@@ -230,32 +362,57 @@ def get_product_detail(
     api_url: Optional[str] = None,
     *,
     normalize: bool = False,
+    session: Optional["requests.Session"] = None,
+    use_cache: bool = True,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or DETAIL_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp) if resolved_app_key and resolved_app_secret else ""
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "shopType": (None, shop_type),
-        "goodsId": (None, str(goods_id)),
-    }
-    data = safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
-    if data is None:
-        return None
-    if not data.get("success", False):
-        print(" Detail API failed:", data)
-        return None
-    try:
-        detail = data["data"]
-    except (KeyError, TypeError):
-        print(" Unexpected detail API response structure:")
-        print(json.dumps(data, ensure_ascii=False, indent=2))
+    url = api_url or DETAIL_API_URL
+    cache_key = (str(goods_id), shop_type, url, app_key or APP_KEY)
+    if use_cache:
+        cached = _detail_cache_get(cache_key)
+        if cached is not None:
+            return _finish_detail(cached, normalize)
+
+    data = api_call(
+        url,
+        {"shopType": shop_type, "goodsId": str(goods_id)},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
+    detail = api_result(data, "detail API", "data", default=_MISSING)
+    if detail is _MISSING:
         return None
 
+    if use_cache and isinstance(detail, dict):
+        _detail_cache_put(cache_key, detail)
+    return _finish_detail(detail, normalize)
+
+
+def get_product_details_bulk(
+    goods_ids: List[str],
+    shop_type: str = "1688",
+    request_timeout_seconds: int = 15,
+    max_concurrency: int = 16,
+    **kwargs: Any,
+) -> Dict[str, Optional[dict]]:
+    """
+    Fetch detail for many goodsIds concurrently. Returns {goodsId: detail or None}
+    in input order; duplicates are fetched once. Extra kwargs go to get_product_detail.
+    """
+    return map_concurrent(
+        lambda goods_id: get_product_detail(
+            goods_id,
+            shop_type=shop_type,
+            request_timeout_seconds=request_timeout_seconds,
+            **kwargs,
+        ),
+        (str(goods_id) for goods_id in goods_ids),
+        max_workers=max_concurrency,
+    )
+
+
+def _finish_detail(detail: Any, normalize: bool) -> Any:
     if normalize:
         try:
             return _normalize_detail_payload(detail)
@@ -271,29 +428,36 @@ def get_image_id(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
+    cache_ttl: float = 0,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or IMAGE_ID_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp) if resolved_app_key and resolved_app_secret else ""
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "imageBase64": (None, image_base64),
-    }
-    data = safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
-    if data is None:
-        return None
-    if not data.get("success", False):
-        print(" Image ID API failed:", data)
-        return None
-    try:
-        return data["data"]
-    except (KeyError, TypeError):
-        print(" Unexpected image ID API response structure:")
-        print(json.dumps(data, ensure_ascii=False, indent=2))
-        return None
+    # The base64 image stays a multipart part; urlencoding would inflate it
+    data = api_call(
+        api_url or IMAGE_ID_API_URL,
+        files={"imageBase64": (None, image_base64)},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+    return api_result(data, "image ID API", "data")
 
 
+def get_image_ids_bulk(
+    images_base64: List[str],
+    request_timeout_seconds: int = 15,
+    max_concurrency: int = 8,
+    **kwargs: Any,
+) -> List[Optional[dict]]:
+    """
+    Upload many images concurrently for image search. Returns one result (or None)
+    per input, in input order; identical images are uploaded once.
+    Extra kwargs go to get_image_id.
+    """
+    results = map_concurrent(
+        lambda image: get_image_id(image, request_timeout_seconds=request_timeout_seconds, **kwargs),
+        images_base64,
+        max_workers=max_concurrency,
+    )
+    return [results[image] for image in images_base64]
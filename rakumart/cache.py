@@ -0,0 +1,60 @@
+"""
+Best-effort JSON file cache under CACHE_DIR, shared across CLI runs.
+
+Entries live in one file per key inside a namespace directory; the file mtime is
+the store time. Any I/O or decode error is treated as a miss.
+"""
+
+from typing import Any, Hashable, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .config import CACHE_DIR
+
+
+def _path(namespace: str, key: Hashable) -> str:
+    digest = hashlib.sha1(repr(key).encode("utf-8"), usedforsecurity=False).hexdigest()
+    return os.path.join(CACHE_DIR, namespace, f"{digest}.json")
+
+
+def disk_get(namespace: str, key: Hashable, ttl: float) -> Optional[Any]:
+    """Return the cached value for `key` if stored less than `ttl` seconds ago."""
+    path = _path(namespace, key)
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def disk_put(namespace: str, key: Hashable, value: Any) -> None:
+    path = _path(namespace, key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def disk_clear(namespace: str) -> None:
+    directory = os.path.join(CACHE_DIR, namespace)
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
@@ -1,9 +1,11 @@
 import argparse
+import operator
 import os
-import json
 from typing import Any
 
 from .config import (
+    APP_KEY,
+    APP_SECRET,
     API_URL,
     DETAIL_API_URL,
     IMAGE_ID_API_URL,
@@ -22,47 +24,41 @@ from .config import (
     PORDER_DETAIL_API_URL,
     LOGISTICS_TRACK_API_URL,
 )
-from .api_search import search_products, get_product_detail, get_image_id
-from .display import display_all_results_table, display_all_search_result_items
-from .db import save_products_to_db
-from .console import SearchResultConsole
-from .filters import collect_categories_from_products as get_available_categories
+from .api_search import search_products, iter_search_products, get_product_detail, get_image_id
+from .filters import count_categories_from_products as count_categories
 from .orders import (
-    create_order, update_order_status, cancel_order, get_order_list, get_order_detail,
-    get_stock_list, create_porder, update_porder_status, cancel_porder,
-    get_porder_list, get_porder_detail, get_logistics_track,
+    LIST_CACHE_NAMESPACE, get_order_list, get_porder_list, get_order_details_bulk, get_porder_details_bulk,
+    invalidate_list_cache,
 )
-from .enrich import enrich_products_with_detail
+from .enrich import enrich_products_with_detail, iter_enriched_products
+from .printing import json_print, json_print_array, json_print_many
 from .meta import get_logistics, get_tags
-try:
-    from .image_processing import process_product_images_from_db, process_all_product_images, ImageProcessor
-except ImportError:
-    # Handle the hyphen in filename
-    import importlib.util
+
+
+def _load_image_processing():
+    """Import the image-processing module on demand (it pulls in PIL, Vision and S3 clients)."""
     import sys
-    from pathlib import Path
-    
-    # Load the image-processing module
-    spec = importlib.util.spec_from_file_location(
-        "image_processing", 
-        Path(__file__).parent / "image-processing.py"
-    )
-    image_processing = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(image_processing)
-    
-    # Make it available in the current namespace
-    sys.modules['rakumart.image_processing'] = image_processing
-    
-    # Import the functions
-    process_product_images_from_db = image_processing.process_product_images_from_db
-    process_all_product_images = image_processing.process_all_product_images
-    ImageProcessor = image_processing.ImageProcessor
+    mod = sys.modules.get("rakumart.image_processing")
+    if mod is not None:
+        return mod
+    try:
+        from . import image_processing as mod  # type: ignore
+    except ImportError:
+        # Handle the hyphen in filename
+        import importlib.util
+        from pathlib import Path
 
+        spec = importlib.util.spec_from_file_location(
+            "image_processing",
+            Path(__file__).parent / "image-processing.py"
+        )
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        sys.modules['rakumart.image_processing'] = mod
+    return mod
 
-def run(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Search products and fetch product details via API")
-    subparsers = parser.add_subparsers(dest="command", required=False)
 
+def _add_search_parser(subparsers) -> None:
     # Search
     search_parser = subparsers.add_parser("search", help="Search products by keyword")
     search_parser.add_argument("keyword", nargs="?", default="laptop", help="Keyword to search (default: laptop)")
@@ -91,6 +87,10 @@ def run(argv: list[str] | None = None) -> int:
     search_parser.add_argument("--with-detail", dest="with_detail", action="store_true", default=True, help="Also fetch detail (images, description) for results [default]")
     search_parser.add_argument("--no-detail", dest="with_detail", action="store_false", help="Do not fetch detail for results")
     search_parser.add_argument("--detail-limit", type=int, default=5, help="Max number of items to enrich with detail (default: 5)")
+    search_parser.add_argument("--detail-concurrency", type=int, default=8, help="Max concurrent detail requests while enriching (default: 8)")
+    search_parser.add_argument("--no-cache", action="store_true", help="Bypass the detail cache (in memory and on disk)")
+    search_parser.add_argument("--compact", action="store_true", help="Print one compact JSON object per line (for piping)")
+    search_parser.add_argument("--array", action="store_true", help="Print all results as one JSON array (after enrichment finishes)")
     search_parser.add_argument("--api-url", type=str, help="Override search API URL")
     search_parser.add_argument("--app-key", type=str, help="Override APP_KEY for this call")
     search_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
@@ -101,6 +101,8 @@ def run(argv: list[str] | None = None) -> int:
     search_parser.add_argument("--save-to-postgres", action="store_true", help="Save results to PostgreSQL (env: DATABASE_URL or PG* vars)")
     search_parser.add_argument("--db-keyword", type=str, help="Override keyword stored with rows (defaults to search keyword)")
 
+
+def _add_detail_parser(subparsers) -> None:
     # Detail
     detail_parser = subparsers.add_parser("detail", help="Get product detail by goodsId")
     detail_parser.add_argument("--goods-id", required=True, help="goodsId to fetch detail for")
@@ -114,7 +116,10 @@ def run(argv: list[str] | None = None) -> int:
     detail_parser.add_argument("--images-only", action="store_true", help="Print only the image URLs array")
     detail_parser.add_argument("--images-and-description", action="store_true", help="Print both images and description together")
     detail_parser.add_argument("--normalize", action="store_true", help="Normalize detail payload per spec")
+    detail_parser.add_argument("--no-cache", action="store_true", help="Bypass the detail cache (in memory and on disk)")
 
+
+def _add_image_parser(subparsers) -> None:
     # Image
     image_parser = subparsers.add_parser("image", help="Get image ID by uploading base64 encoded image")
     image_parser.add_argument("--image-base64", required=True, help="Base64 encoded image data")
@@ -126,6 +131,8 @@ def run(argv: list[str] | None = None) -> int:
     image_parser.add_argument("--image-id-only", action="store_true", help="Print only the image ID")
     image_parser.add_argument("--link-only", action="store_true", help="Print only the search link")
 
+
+def _add_logistics_parser(subparsers) -> None:
     # Logistics names/tags
     logistics_parser = subparsers.add_parser("logistics", help="Get current useful logistics information")
     logistics_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -135,7 +142,10 @@ def run(argv: list[str] | None = None) -> int:
     logistics_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     logistics_parser.add_argument("--names-only", action="store_true", help="Print only logistics names")
     logistics_parser.add_argument("--ids-only", action="store_true", help="Print only logistics IDs")
+    logistics_parser.add_argument("--no-cache", action="store_true", help="Bypass the local reference-data cache")
+
 
+def _add_tags_parser(subparsers) -> None:
     tags_parser = subparsers.add_parser("tags", help="Get current useful tags information")
     tags_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
     tags_parser.add_argument("--tags-api-url", type=str, help="Override tags API URL")
@@ -144,7 +154,10 @@ def run(argv: list[str] | None = None) -> int:
     tags_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     tags_parser.add_argument("--types-only", action="store_true", help="Print only tag types")
     tags_parser.add_argument("--translations-only", action="store_true", help="Print only Japanese translations")
+    tags_parser.add_argument("--no-cache", action="store_true", help="Bypass the local reference-data cache")
 
+
+def _add_order_parser(subparsers) -> None:
     # Orders
     order_parser = subparsers.add_parser("order", help="Create an order with multiple products")
     order_parser.add_argument("--purchase-order", required=True, help="Customer's original order number")
@@ -160,6 +173,8 @@ def run(argv: list[str] | None = None) -> int:
     order_parser.add_argument("--order-sn-only", action="store_true", help="Print only the order number")
     order_parser.add_argument("--status-only", action="store_true", help="Print only the order status")
 
+
+def _add_update_status_parser(subparsers) -> None:
     update_parser = subparsers.add_parser("update-status", help="Update order status")
     update_parser.add_argument("--order-sn", required=True, help="rakumart system order number")
     update_parser.add_argument("--status", required=True, choices=["10", "20"], help="New status: 10-Provisional, 20-Official")
@@ -170,6 +185,8 @@ def run(argv: list[str] | None = None) -> int:
     update_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     update_parser.add_argument("--order-sn-only", action="store_true", help="Print only the order number from response")
 
+
+def _add_cancel_parser(subparsers) -> None:
     cancel_parser = subparsers.add_parser("cancel", help="Cancel an order")
     cancel_parser.add_argument("--order-sn", required=True, help="rakumart system order number")
     cancel_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -179,6 +196,8 @@ def run(argv: list[str] | None = None) -> int:
     cancel_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     cancel_parser.add_argument("--raw", action="store_true", help="Print raw API response as JSON")
 
+
+def _add_orders_parser(subparsers) -> None:
     order_list_parser = subparsers.add_parser("orders", help="Fetch paginated order list")
     order_list_parser.add_argument("--page", type=int, default=1, help="Page number (default: 1)")
     order_list_parser.add_argument("--page-size", type=int, default=10, help="Items per page (default: 10)")
@@ -188,7 +207,13 @@ def run(argv: list[str] | None = None) -> int:
     order_list_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
     order_list_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     order_list_parser.add_argument("--summary", action="store_true", help="Print only a summary table of orders")
+    order_list_parser.add_argument("--array", action="store_true", help="With --summary, print the rows as one JSON array")
+    order_list_parser.add_argument("--with-detail", action="store_true", help="Fetch each listed order's detail concurrently and attach it as 'detail'")
+    order_list_parser.add_argument("--detail-concurrency", type=int, default=8, help="Max concurrent detail requests for --with-detail (default: 8)")
+    order_list_parser.add_argument("--prefetch-next", action="store_true", help="Read this page from, and store page+1 in, the disk cache (30s; cleared by any order change)")
+
 
+def _add_order_detail_parser(subparsers) -> None:
     order_detail_parser = subparsers.add_parser("order-detail", help="Fetch order detail by order_sn")
     order_detail_parser.add_argument("--order-sn", required=True, help="rakumart system order number")
     order_detail_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -198,6 +223,8 @@ def run(argv: list[str] | None = None) -> int:
     order_detail_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     order_detail_parser.add_argument("--items-only", action="store_true", help="Print only order_detail items array")
 
+
+def _add_stock_parser(subparsers) -> None:
     stock_list_parser = subparsers.add_parser("stock", help="Fetch stock list")
     stock_list_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
     stock_list_parser.add_argument("--stock-api-url", type=str, help="Override stock list API URL")
@@ -206,6 +233,8 @@ def run(argv: list[str] | None = None) -> int:
     stock_list_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     stock_list_parser.add_argument("--raw", action="store_true", help="Print raw API response as JSON")
 
+
+def _add_porder_parser(subparsers) -> None:
     porder_parser = subparsers.add_parser("porder", help="Create a delivery order (Porder)")
     porder_parser.add_argument("--status", required=True, choices=["10", "20"], help="Porder status: 10-Provisional, 20-Official")
     porder_parser.add_argument("--logistics-id", required=True, help="Logistics ID")
@@ -221,6 +250,8 @@ def run(argv: list[str] | None = None) -> int:
     porder_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     porder_parser.add_argument("--porder-sn-only", action="store_true", help="Print only the porder_sn from response")
 
+
+def _add_porder_update_status_parser(subparsers) -> None:
     upd_porder_parser = subparsers.add_parser("porder-update-status", help="Update porder status")
     upd_porder_parser.add_argument("--porder-sn", required=True, help="rakumart system porder number")
     upd_porder_parser.add_argument("--status", required=True, choices=["10", "20"], help="Porder status: 10-Provisional, 20-Official")
@@ -230,6 +261,8 @@ def run(argv: list[str] | None = None) -> int:
     upd_porder_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
     upd_porder_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
 
+
+def _add_porder_cancel_parser(subparsers) -> None:
     cancel_porder_parser = subparsers.add_parser("porder-cancel", help="Cancel a porder")
     cancel_porder_parser.add_argument("--porder-sn", required=True, help="rakumart system porder number")
     cancel_porder_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -238,6 +271,8 @@ def run(argv: list[str] | None = None) -> int:
     cancel_porder_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
     cancel_porder_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
 
+
+def _add_porders_parser(subparsers) -> None:
     porder_list_parser = subparsers.add_parser("porders", help="Fetch porder list")
     porder_list_parser.add_argument("--page", type=int, default=1, help="Page number (default: 1)")
     porder_list_parser.add_argument("--page-size", type=int, default=10, help="Items per page (default: 10)")
@@ -248,7 +283,13 @@ def run(argv: list[str] | None = None) -> int:
     porder_list_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
     porder_list_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     porder_list_parser.add_argument("--summary", action="store_true", help="Print only a summary table of porders")
+    porder_list_parser.add_argument("--array", action="store_true", help="With --summary, print the rows as one JSON array")
+    porder_list_parser.add_argument("--with-detail", action="store_true", help="Fetch each listed porder's detail concurrently and attach it as 'detail'")
+    porder_list_parser.add_argument("--detail-concurrency", type=int, default=8, help="Max concurrent detail requests for --with-detail (default: 8)")
+    porder_list_parser.add_argument("--prefetch-next", action="store_true", help="Read this page from, and store page+1 in, the disk cache (30s; cleared by any order change)")
+
 
+def _add_porder_detail_parser(subparsers) -> None:
     porder_detail_parser = subparsers.add_parser("porder-detail", help="Fetch porder detail by porder_sn")
     porder_detail_parser.add_argument("--porder-sn", required=True, help="rakumart system porder number")
     porder_detail_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -258,6 +299,8 @@ def run(argv: list[str] | None = None) -> int:
     porder_detail_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     porder_detail_parser.add_argument("--items-only", action="store_true", help="Print only porder_detail items array")
 
+
+def _add_ltrack_parser(subparsers) -> None:
     ltrack_parser = subparsers.add_parser("ltrack", help="Fetch international logistics tracking by express number")
     ltrack_parser.add_argument("--express-no", required=True, help="International logistics number")
     ltrack_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
@@ -267,11 +310,15 @@ def run(argv: list[str] | None = None) -> int:
     ltrack_parser.add_argument("--verbose", action="store_true", help="Print request payload and endpoint")
     ltrack_parser.add_argument("--timeline-only", action="store_true", help="Print only time/address timeline entries")
 
+
+def _add_gui_parser(subparsers) -> None:
     gui_parser = subparsers.add_parser("gui", help="Open a simple GUI to search and view details")
     gui_parser.add_argument("--shop-type", type=str, default="1688", help="Shop type (default: 1688)")
     gui_parser.add_argument("--timeout", type=int, default=15, help="HTTP timeout seconds (default: 15)")
     gui_parser.add_argument("--detail-limit", type=int, default=5, help="Max items to enrich with detail when listing")
 
+
+def _add_console_parser(subparsers) -> None:
     console_parser = subparsers.add_parser("console", help="Interactive console for search results")
     console_parser.add_argument("keyword", nargs="?", default="laptop", help="Keyword to search (default: laptop)")
     console_parser.add_argument("--page", type=int, default=1, help="Page number (default: 1)")
@@ -284,7 +331,11 @@ def run(argv: list[str] | None = None) -> int:
     console_parser.add_argument("--with-detail", dest="with_detail", action="store_true", default=True, help="Also fetch detail for results [default]")
     console_parser.add_argument("--no-detail", dest="with_detail", action="store_false", help="Do not fetch detail for results")
     console_parser.add_argument("--detail-limit", type=int, default=10, help="Max number of items to enrich with detail (default: 10)")
+    console_parser.add_argument("--detail-concurrency", type=int, default=8, help="Max concurrent detail requests while enriching (default: 8)")
+    console_parser.add_argument("--no-cache", action="store_true", help="Bypass the detail cache (in memory and on disk)")
 
+
+def _add_process_images_parser(subparsers) -> None:
     # Image processing
     process_parser = subparsers.add_parser("process-images", help="Process product images with AI")
     process_parser.add_argument("--product-id", type=str, help="Process images for specific product ID")
@@ -294,6 +345,8 @@ def run(argv: list[str] | None = None) -> int:
     process_parser.add_argument("--no-save", action="store_true", help="Don't save processed images to local storage")
     process_parser.add_argument("--verbose", action="store_true", help="Verbose output")
 
+
+def _add_optimize_names_parser(subparsers) -> None:
     # Product name optimization
     optimize_parser = subparsers.add_parser("optimize-names", help="Optimize product names using OpenAI API")
     optimize_parser.add_argument("--product-ids", nargs="+", help="Specific product IDs to optimize")
@@ -301,6 +354,8 @@ def run(argv: list[str] | None = None) -> int:
     optimize_parser.add_argument("--dry-run", action="store_true", help="Show what would be updated without making changes")
     optimize_parser.add_argument("--verbose", action="store_true", help="Verbose output")
 
+
+def _add_categories_parser(subparsers) -> None:
     # Categories summary
     categories_parser = subparsers.add_parser("categories", help="Search and summarize categories from results")
     categories_parser.add_argument("keyword", nargs="?", default="laptop", help="Keyword to search (default: laptop)")
@@ -312,367 +367,626 @@ def run(argv: list[str] | None = None) -> int:
     categories_parser.add_argument("--app-secret", type=str, help="Override APP_SECRET for this call")
     categories_parser.add_argument("--api-url", type=str, help="Override search API URL")
 
-    args = parser.parse_args(argv)
 
-    if getattr(args, "command", None) is None:
-        argv2 = argv if argv is not None else os.sys.argv[1:]
-        if any(tok == "detail" or tok.startswith("--goods-id") for tok in argv2):
-            args = parser.parse_args(["detail", *argv2])
-        elif any(tok == "image" or tok.startswith("--image-base64") for tok in argv2):
-            args = parser.parse_args(["image", *argv2])
-        elif any(tok == "logistics" for tok in argv2):
-            args = parser.parse_args(["logistics", *argv2])
-        elif any(tok == "tags" for tok in argv2):
-            args = parser.parse_args(["tags", *argv2])
-        elif any(tok == "order" or tok.startswith("--purchase-order") for tok in argv2):
-            args = parser.parse_args(["order", *argv2])
-        elif any(tok == "update-status" or tok.startswith("--order-sn") for tok in argv2):
-            args = parser.parse_args(["update-status", *argv2])
-        elif any(tok == "cancel" or tok.startswith("--order-sn") for tok in argv2):
-            args = parser.parse_args(["cancel", *argv2])
-        elif any(tok == "orders" or tok.startswith("--page") for tok in argv2):
-            args = parser.parse_args(["orders", *argv2])
-        elif any(tok == "order-detail" or tok.startswith("--order-sn") for tok in argv2):
-            args = parser.parse_args(["order-detail", *argv2])
-        elif any(tok == "stock" for tok in argv2):
-            args = parser.parse_args(["stock", *argv2])
-        elif any(tok == "porder" or tok.startswith("--porder-detail") for tok in argv2):
-            args = parser.parse_args(["porder", *argv2])
-        elif any(tok == "porder-update-status" or tok.startswith("--porder-sn") and "porder-update-status" in argv2 for tok in argv2):
-            args = parser.parse_args(["porder-update-status", *argv2])
-        elif any(tok == "porder-cancel" or tok.startswith("--porder-sn") and "porder-cancel" in argv2 for tok in argv2):
-            args = parser.parse_args(["porder-cancel", *argv2])
-        elif any(tok == "porders" or tok.startswith("--page") for tok in argv2):
-            args = parser.parse_args(["porders", *argv2])
-        elif any(tok == "porder-detail" or tok.startswith("--porder-sn") for tok in argv2):
-            args = parser.parse_args(["porder-detail", *argv2])
-        elif any(tok == "ltrack" or tok.startswith("--express-no") for tok in argv2):
-            args = parser.parse_args(["ltrack", *argv2])
-        elif any(tok == "categories" for tok in argv2):
-            args = parser.parse_args(["categories", *argv2])
-        elif any(tok == "process-images" for tok in argv2):
-            args = parser.parse_args(["process-images", *argv2])
-        elif any(tok == "optimize-names" for tok in argv2):
-            args = parser.parse_args(["optimize-names", *argv2])
-        else:
-            args = parser.parse_args(["search", *argv2])
+def _api_kwargs(args, url_attr: str) -> dict[str, Any]:
+    return {
+        "request_timeout_seconds": args.timeout,
+        "app_key": getattr(args, "app_key", None),
+        "app_secret": getattr(args, "app_secret", None),
+        "api_url": getattr(args, url_attr, None),
+    }
+
+
+def _response_data(data: dict | None, *keys: str) -> Any:
+    """Walk `keys` under a successful response envelope; report and return None otherwise."""
+    from .http import api_result
+
+    return api_result(data, "API", *keys)
+
+
+def _add_clear_cache_parser(subparsers) -> None:
+    subparsers.add_parser("clear-cache", help="Delete cached product details, logistics/tags and prefetched list pages")
+
+
+# Subcommand name -> function adding its parser. run() builds only the one
+# named on the command line, so a normal invocation does not pay for all of them.
+_SUBPARSER_BUILDERS = {
+    "search": _add_search_parser,
+    "detail": _add_detail_parser,
+    "image": _add_image_parser,
+    "logistics": _add_logistics_parser,
+    "tags": _add_tags_parser,
+    "order": _add_order_parser,
+    "update-status": _add_update_status_parser,
+    "cancel": _add_cancel_parser,
+    "orders": _add_orders_parser,
+    "order-detail": _add_order_detail_parser,
+    "stock": _add_stock_parser,
+    "porder": _add_porder_parser,
+    "porder-update-status": _add_porder_update_status_parser,
+    "porder-cancel": _add_porder_cancel_parser,
+    "porders": _add_porders_parser,
+    "porder-detail": _add_porder_detail_parser,
+    "ltrack": _add_ltrack_parser,
+    "gui": _add_gui_parser,
+    "console": _add_console_parser,
+    "process-images": _add_process_images_parser,
+    "optimize-names": _add_optimize_names_parser,
+    "categories": _add_categories_parser,
+    "clear-cache": _add_clear_cache_parser,
+}
+
+
+# Flags that only one subcommand takes, for the legacy command-less form
+# (e.g. `main.py --goods-id 123`). Flags shared by several commands (--order-sn,
+# --porder-sn, --page) cannot pick one, so those invocations default to search.
+_LEGACY_FLAG_COMMANDS = {
+    "--goods-id": "detail",
+    "--image-base64": "image",
+    "--purchase-order": "order",
+    "--porder-detail": "porder",
+    "--express-no": "ltrack",
+}
+
 
-    # Delegate to the same handlers as in main.py
-    # Rather than duplicating the large routing, import main and reuse its block is heavy.
-    # Here we replicate minimal handling for search/detail/image/gui/console and keep others via orders module.
-    if args.command == "search":
+def _legacy_command(argv: list[str]) -> str:
+    for tok in argv:
+        command = _LEGACY_FLAG_COMMANDS.get(tok.split("=", 1)[0])
+        if command is not None:
+            return command
+    return "search"
+
+
+def _cmd_search(args) -> int:
+    # Resolved once: the detail lambda below runs per enriched product.
+    shop_type = getattr(args, "shop_type", "1688")
+    app_key = getattr(args, "app_key", None)
+    app_secret = getattr(args, "app_secret", None)
+    use_cache = not getattr(args, "no_cache", False)
+    search_kwargs = dict(
+        page=args.page,
+        page_size=args.page_size,
+        price_min=getattr(args, "price_min", None),
+        price_max=getattr(args, "price_max", None),
+        order_key=getattr(args, "order_key", None),
+        order_value=getattr(args, "order_value", None),
+        categories=getattr(args, "categories", None),
+        subcategories=getattr(args, "subcategories", None),
+        sub_subcategories=getattr(args, "sub_subcategories", None),
+        max_length=getattr(args, "max_length", None),
+        max_width=getattr(args, "max_width", None),
+        max_height=getattr(args, "max_height", None),
+        min_inventory=getattr(args, "min_inventory", None),
+        max_delivery_days=getattr(args, "max_delivery_days", None),
+        max_shipping_fee=getattr(args, "max_shipping_fee", None),
+        request_timeout_seconds=args.timeout,
+        shop_type=shop_type,
+        app_key=app_key,
+        app_secret=app_secret,
+        api_url=getattr(args, "api_url", None),
+    )
+    with_detail = getattr(args, "with_detail", True)
+    if with_detail:
+        # Streamed so detail requests start while the rest of the page is parsed
+        products = iter_search_products(args.keyword, **search_kwargs)
+    else:
         products = search_products(
             args.keyword,
-            page=args.page,
-            page_size=args.page_size,
-            price_min=getattr(args, "price_min", None),
-            price_max=getattr(args, "price_max", None),
-            order_key=getattr(args, "order_key", None),
-            order_value=getattr(args, "order_value", None),
-            categories=getattr(args, "categories", None),
-            subcategories=getattr(args, "subcategories", None),
-            sub_subcategories=getattr(args, "sub_subcategories", None),
-            max_length=getattr(args, "max_length", None),
-            max_width=getattr(args, "max_width", None),
-            max_height=getattr(args, "max_height", None),
             max_weight=getattr(args, "max_weight", None),
             jpy_price_min=getattr(args, "jpy_price_min", None),
             jpy_price_max=getattr(args, "jpy_price_max", None),
             exchange_rate=getattr(args, "exchange_rate", 20.0),
             strict_mode=getattr(args, "strict", False),
-            min_inventory=getattr(args, "min_inventory", None),
-            max_delivery_days=getattr(args, "max_delivery_days", None),
-            max_shipping_fee=getattr(args, "max_shipping_fee", None),
-            request_timeout_seconds=args.timeout,
-            shop_type=getattr(args, "shop_type", "1688"),
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "api_url", None),
-        )
-        if getattr(args, "with_detail", True) and products:
-            limit = max(0, int(getattr(args, "detail_limit", 0)))
-            enrich_products_with_detail(
-                products,
-                get_detail_fn=lambda **kwargs: get_product_detail(
-                    goods_id=kwargs.get("goods_id"),
-                    shop_type=kwargs.get("shop_type"),
-                    request_timeout_seconds=kwargs.get("request_timeout_seconds"),
-                    app_key=getattr(args, "app_key", None),
-                    app_secret=getattr(args, "app_secret", None),
-                    api_url=None,
-                ),
-                shop_type=getattr(args, "shop_type", "1688"),
-                request_timeout_seconds=args.timeout,
-                limit=limit,
-            )
-        if getattr(args, "show_all_fields", False):
-            display_all_search_result_items(products, show_empty=getattr(args, "show_empty_fields", False))
-        elif getattr(args, "display_all", False):
-            display_all_results_table(products)
-        else:
-            for p in products:
-                print(json.dumps(p, ensure_ascii=False, indent=2))
-        if getattr(args, "save_to_postgres", False) and products:
-            saved = save_products_to_db(products, keyword=(getattr(args, "db_keyword", None) or args.keyword))
-            print(f"Saved {saved} products to PostgreSQL.")
-        return 0
-    elif args.command == "categories":
-        products = search_products(
-            args.keyword,
-            page=args.page,
-            page_size=args.page_size,
-            request_timeout_seconds=args.timeout,
-            shop_type=getattr(args, "shop_type", "1688"),
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "api_url", None),
+            **search_kwargs,
         )
-        if not products:
-            print(" No products found.")
-            return 0
-        categories_info = get_available_categories(products)
-        print(f" Found {len(products)} products with the following categories:")
-        print("\nCategories:")
-        for cat in categories_info["categories"]:
-            print(f"  - {cat}")
-        print("\nSubcategories:")
-        for subcat in categories_info["subcategories"]:
-            print(f"  - {subcat}")
-        print("\nSub-subcategories:")
-        for sub_subcat in categories_info["sub_subcategories"]:
-            print(f"  - {sub_subcat}")
-        return 0
-    elif args.command == "detail":
-        detail = get_product_detail(
-            goods_id=args.goods_id,
-            shop_type=args.shop_type,
-            request_timeout_seconds=args.timeout,
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "detail_api_url", None),
-            normalize=getattr(args, "normalize", False),
-        )
-        if detail is None:
-            print(" No detail returned.")
-            return 1
-        if getattr(args, "images_and_description", False):
-            out: dict[str, Any] = {
-                "images": detail.get("images", []),
-                "description": detail.get("description", ""),
-            }
-            print(json.dumps(out, ensure_ascii=False, indent=2))
-        elif getattr(args, "description_only", False):
-            print(detail.get("description", ""))
-        elif getattr(args, "images_only", False):
-            print(json.dumps(detail.get("images", []), ensure_ascii=False, indent=2))
-        else:
-            print(json.dumps(detail, ensure_ascii=False, indent=2))
-        return 0
-    elif args.command == "image":
-        result = get_image_id(
-            image_base64=args.image_base64,
+    show_all_fields = getattr(args, "show_all_fields", False)
+    display_all = getattr(args, "display_all", False)
+    print_json = not (show_all_fields or display_all)
+    compact = getattr(args, "compact", False)
+    as_array = getattr(args, "array", False)
+    if with_detail:
+        limit = max(0, int(getattr(args, "detail_limit", 0)))
+        stream, products = products, []
+        for p in iter_enriched_products(
+            stream,
+            get_detail_fn=lambda **kwargs: get_product_detail(
+                goods_id=kwargs.get("goods_id"),
+                shop_type=kwargs.get("shop_type"),
+                request_timeout_seconds=kwargs.get("request_timeout_seconds"),
+                app_key=app_key,
+                app_secret=app_secret,
+                api_url=None,
+                use_cache=use_cache,
+            ),
+            shop_type=shop_type,
             request_timeout_seconds=args.timeout,
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "image_api_url", None),
-        )
-        if result is None:
-            print(" No image ID returned.")
-            return 1
-        if getattr(args, "image_id_only", False):
-            print(result.get("imageId", ""))
-        elif getattr(args, "link_only", False):
-            print(result.get("link", ""))
-        else:
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        return 0
-    elif args.command == "gui":
-        from .gui import run_gui
-        run_gui(shop_type=getattr(args, "shop_type", "1688"), timeout=args.timeout, detail_limit=getattr(args, "detail_limit", 5))
-        return 0
-    elif args.command == "console":
-        products = search_products(
-            args.keyword,
-            page=args.page,
-            page_size=args.page_size,
-            request_timeout_seconds=args.timeout,
-            shop_type=getattr(args, "shop_type", "1688"),
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "api_url", None),
-        )
-        if getattr(args, "with_detail", True) and products:
-            limit = max(0, int(getattr(args, "detail_limit", 0)))
-            enrich_products_with_detail(
-                products,
-                get_detail_fn=lambda **kwargs: get_product_detail(
-                    goods_id=kwargs.get("goods_id"),
-                    shop_type=kwargs.get("shop_type"),
-                    request_timeout_seconds=kwargs.get("request_timeout_seconds"),
-                    api_url=None,
-                ),
-                shop_type=getattr(args, "shop_type", "1688"),
-                request_timeout_seconds=args.timeout,
-                limit=limit,
-            )
-        if not products:
-            print("No products found.")
-            return 0
-        console = SearchResultConsole(products)
-        console.cmdloop()
-        return 0
-    elif args.command == "logistics":
-        data = get_logistics(
-            request_timeout_seconds=args.timeout,
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "logistics_api_url", None),
-        )
-        if not data:
-            print(" No data returned.")
-            return 1
-        if getattr(args, "names_only", False):
-            try:
-                rows = data.get("data", [])
-                for row in rows:
-                    print(row.get("name"))
-            except Exception:
-                print(json.dumps(data, ensure_ascii=False, indent=2))
-        elif getattr(args, "ids_only", False):
-            try:
-                rows = data.get("data", [])
-                for row in rows:
-                    print(row.get("id"))
-            except Exception:
-                print(json.dumps(data, ensure_ascii=False, indent=2))
-        else:
-            print(json.dumps(data, ensure_ascii=False, indent=2))
+            limit=limit,
+            max_workers=max(1, getattr(args, "detail_concurrency", 8)),
+        ):
+            products.append(p)
+            # Emit each product as soon as its detail is in, while later fetches run
+            if print_json and not as_array:
+                json_print_many([p], compact=compact)
+        if print_json and as_array:
+            json_print_array(products, compact=compact)
+    elif print_json and as_array:
+        json_print_array(products, compact=compact)
+    elif print_json:
+        json_print_many(products, compact=compact)
+    if show_all_fields:
+        from .display import display_all_search_result_items
+        display_all_search_result_items(products, show_empty=getattr(args, "show_empty_fields", False))
+    elif display_all:
+        from .display import display_all_results_table
+        display_all_results_table(products)
+    if getattr(args, "save_to_postgres", False) and products:
+        from .db import save_products_to_db
+        saved = save_products_to_db(products, keyword=(getattr(args, "db_keyword", None) or args.keyword))
+        print(f"Saved {saved} products to PostgreSQL.")
+    return 0
+
+
+def _cmd_categories(args) -> int:
+    products = search_products(
+        args.keyword,
+        page=args.page,
+        page_size=args.page_size,
+        request_timeout_seconds=args.timeout,
+        shop_type=getattr(args, "shop_type", "1688"),
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "api_url", None),
+    )
+    if not products:
+        print(" No products found.")
         return 0
-    elif args.command == "tags":
-        data = get_tags(
+    counts = count_categories(products)
+    print(f" Found {len(products)} products with the following categories:")
+    for title, level in (("Categories", "categories"), ("Subcategories", "subcategories"), ("Sub-subcategories", "sub_subcategories")):
+        print(f"\n{title}:")
+        for name, count in counts[level].items():
+            print(f"  - {name} ({count})")
+    return 0
+
+
+def _cmd_detail(args) -> int:
+    detail = get_product_detail(
+        goods_id=args.goods_id,
+        shop_type=args.shop_type,
+        request_timeout_seconds=args.timeout,
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "detail_api_url", None),
+        normalize=getattr(args, "normalize", False),
+        use_cache=not getattr(args, "no_cache", False),
+    )
+    if detail is None:
+        print(" No detail returned.")
+        return 1
+    if getattr(args, "images_and_description", False):
+        out: dict[str, Any] = {
+            "images": detail.get("images", []),
+            "description": detail.get("description", ""),
+        }
+        json_print(out)
+    elif getattr(args, "description_only", False):
+        print(detail.get("description", ""))
+    elif getattr(args, "images_only", False):
+        json_print(detail.get("images", []))
+    else:
+        json_print(detail)
+    return 0
+
+
+def _cmd_image(args) -> int:
+    result = get_image_id(
+        image_base64=args.image_base64,
+        request_timeout_seconds=args.timeout,
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "image_api_url", None),
+    )
+    if result is None:
+        print(" No image ID returned.")
+        return 1
+    if getattr(args, "image_id_only", False):
+        print(result.get("imageId", ""))
+    elif getattr(args, "link_only", False):
+        print(result.get("link", ""))
+    else:
+        json_print(result)
+    return 0
+
+
+def _cmd_gui(args) -> int:
+    from .gui import run_gui
+    run_gui(shop_type=getattr(args, "shop_type", "1688"), timeout=args.timeout, detail_limit=getattr(args, "detail_limit", 5))
+    return 0
+
+
+def _cmd_console(args) -> int:
+    shop_type = getattr(args, "shop_type", "1688")
+    use_cache = not getattr(args, "no_cache", False)
+    products = search_products(
+        args.keyword,
+        page=args.page,
+        page_size=args.page_size,
+        request_timeout_seconds=args.timeout,
+        shop_type=shop_type,
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "api_url", None),
+    )
+    if getattr(args, "with_detail", True) and products:
+        limit = max(0, int(getattr(args, "detail_limit", 0)))
+        enrich_products_with_detail(
+            products,
+            get_detail_fn=lambda **kwargs: get_product_detail(
+                goods_id=kwargs.get("goods_id"),
+                shop_type=kwargs.get("shop_type"),
+                request_timeout_seconds=kwargs.get("request_timeout_seconds"),
+                api_url=None,
+                use_cache=use_cache,
+            ),
+            shop_type=shop_type,
             request_timeout_seconds=args.timeout,
-            app_key=getattr(args, "app_key", None),
-            app_secret=getattr(args, "app_secret", None),
-            api_url=getattr(args, "tags_api_url", None),
+            limit=limit,
+            max_workers=max(1, getattr(args, "detail_concurrency", 8)),
         )
-        if not data:
-            print(" No data returned.")
-            return 1
-        if getattr(args, "types_only", False):
-            try:
-                rows = data.get("data", [])
-                for row in rows:
-                    print(row.get("type"))
-            except Exception:
-                print(json.dumps(data, ensure_ascii=False, indent=2))
-        elif getattr(args, "translations_only", False):
-            try:
-                rows = data.get("data", [])
-                for row in rows:
-                    print(row.get("japanese"))
-            except Exception:
-                print(json.dumps(data, ensure_ascii=False, indent=2))
-        else:
-            print(json.dumps(data, ensure_ascii=False, indent=2))
+    if not products:
+        print("No products found.")
         return 0
-    elif args.command == "process-images":
-        save_locally = not getattr(args, "no_save", False)
-        output_dir = getattr(args, "output_dir", "processed_images")
+    from .console import SearchResultConsole
+    console = SearchResultConsole(products)
+    console.cmdloop()
+    return 0
+
+
+def _cmd_logistics(args) -> int:
+    data = get_logistics(
+        request_timeout_seconds=args.timeout,
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "logistics_api_url", None),
+        use_cache=not getattr(args, "no_cache", False),
+    )
+    if not data:
+        print(" No data returned.")
+        return 1
+    if getattr(args, "names_only", False):
+        try:
+            rows = data.get("data", [])
+            for row in rows:
+                print(row.get("name"))
+        except Exception:
+            json_print(data)
+    elif getattr(args, "ids_only", False):
+        try:
+            rows = data.get("data", [])
+            for row in rows:
+                print(row.get("id"))
+        except Exception:
+            json_print(data)
+    else:
+        json_print(data)
+    return 0
+
+
+def _cmd_tags(args) -> int:
+    data = get_tags(
+        request_timeout_seconds=args.timeout,
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+        api_url=getattr(args, "tags_api_url", None),
+        use_cache=not getattr(args, "no_cache", False),
+    )
+    if not data:
+        print(" No data returned.")
+        return 1
+    if getattr(args, "types_only", False):
+        try:
+            rows = data.get("data", [])
+            for row in rows:
+                print(row.get("type"))
+        except Exception:
+            json_print(data)
+    elif getattr(args, "translations_only", False):
+        try:
+            rows = data.get("data", [])
+            for row in rows:
+                print(row.get("japanese"))
+        except Exception:
+            json_print(data)
+    else:
+        json_print(data)
+    return 0
+
+
+def _cmd_process_images(args) -> int:
+    image_processing = _load_image_processing()
+    save_locally = not getattr(args, "no_save", False)
+    output_dir = getattr(args, "output_dir", "processed_images")
+    
+    if getattr(args, "test_image", None):
+        # Test processing on a single image
+        processor = image_processing.ImageProcessor()
+        result = processor.process_image(args.test_image, save_locally=save_locally, output_dir=output_dir)
         
-        if getattr(args, "test_image", None):
-            # Test processing on a single image
-            processor = ImageProcessor()
-            result = processor.process_image(args.test_image, save_locally=save_locally, output_dir=output_dir)
-            
-            if result:
-                print(f"Processing completed successfully!")
-                print(f"Original URL: {result['original_url']}")
-                print(f"Processed size: {result['processed_size']} bytes")
-                print(f"Text detections: {result['text_detections']}")
-                print(f"Face detections: {result['face_detections']}")
-                print(f"Logo detections: {result['logo_detections']}")
-                if result['local_path']:
-                    print(f"Saved to: {result['local_path']}")
-                else:
-                    print("Image not saved to local storage (--no-save flag used)")
+        if result:
+            print(f"Processing completed successfully!")
+            print(f"Original URL: {result['original_url']}")
+            print(f"Processed size: {result['processed_size']} bytes")
+            print(f"Text detections: {result['text_detections']}")
+            print(f"Face detections: {result['face_detections']}")
+            print(f"Logo detections: {result['logo_detections']}")
+            if result['local_path']:
+                print(f"Saved to: {result['local_path']}")
             else:
-                print("Failed to process image")
-                return 1
-        elif getattr(args, "product_id", None):
-            # Process images for a specific product
-            result = process_product_images_from_db(args.product_id, save_locally=save_locally, output_dir=output_dir)
-            print(json.dumps(result, ensure_ascii=False, indent=2))
+                print("Image not saved to local storage (--no-save flag used)")
         else:
-            # Process images for all products
-            limit = getattr(args, "limit", None)
-            result = process_all_product_images(limit=limit)
-            print(json.dumps(result, ensure_ascii=False, indent=2))
-        return 0
-    elif args.command == "optimize-names":
-        from .product_optimizer import update_product_names_in_db, get_products_needing_optimization, ProductNameOptimizer
-        
-        product_ids = getattr(args, "product_ids", None)
+            print("Failed to process image")
+            return 1
+    elif getattr(args, "product_id", None):
+        # Process images for a specific product
+        result = image_processing.process_product_images_from_db(args.product_id, save_locally=save_locally, output_dir=output_dir)
+        json_print(result)
+    else:
+        # Process images for all products
         limit = getattr(args, "limit", None)
-        dry_run = getattr(args, "dry_run", False)
-        verbose = getattr(args, "verbose", False)
+        result = image_processing.process_all_product_images(limit=limit)
+        json_print(result)
+    return 0
+
+
+def _cmd_optimize_names(args) -> int:
+    from .product_optimizer import update_product_names_in_db, get_products_needing_optimization, ProductNameOptimizer
+    
+    product_ids = getattr(args, "product_ids", None)
+    limit = getattr(args, "limit", None)
+    dry_run = getattr(args, "dry_run", False)
+    verbose = getattr(args, "verbose", False)
+    
+    if dry_run:
+        # Show what would be updated without making changes
+        products = get_products_needing_optimization(limit=limit)
+        print(f"Found {len(products)} products that would be optimized:")
+        print()
         
-        if dry_run:
-            # Show what would be updated without making changes
-            products = get_products_needing_optimization(limit=limit)
-            print(f"Found {len(products)} products that would be optimized:")
+        optimizer = ProductNameOptimizer()
+        for i, product in enumerate(products[:10]):  # Show first 10 as preview
+            result = optimizer.optimize_product(product['product_id'], product['product_name'])
+            print(f"{i+1}. Product ID: {product['product_id']}")
+            try:
+                print(f"   Original: {product['product_name']}")
+                print(f"   Optimized: {result.optimized_name}")
+                print(f"   Catch Copy: {result.catch_copy}")
+            except UnicodeEncodeError:
+                print(f"   Original: [Japanese text - {len(product['product_name'])} chars]")
+                print(f"   Optimized: [Japanese text - {len(result.optimized_name)} chars]")
+                print(f"   Catch Copy: [Japanese text - {len(result.catch_copy)} chars]")
             print()
-            
-            optimizer = ProductNameOptimizer()
-            for i, product in enumerate(products[:10]):  # Show first 10 as preview
-                result = optimizer.optimize_product(product['product_id'], product['product_name'])
-                print(f"{i+1}. Product ID: {product['product_id']}")
-                try:
-                    print(f"   Original: {product['product_name']}")
-                    print(f"   Optimized: {result.optimized_name}")
-                    print(f"   Catch Copy: {result.catch_copy}")
-                except UnicodeEncodeError:
-                    print(f"   Original: [Japanese text - {len(product['product_name'])} chars]")
-                    print(f"   Optimized: [Japanese text - {len(result.optimized_name)} chars]")
-                    print(f"   Catch Copy: [Japanese text - {len(result.catch_copy)} chars]")
-                print()
-            
-            if len(products) > 10:
-                print(f"... and {len(products) - 10} more products")
-            
-            print(f"\nTotal products to optimize: {len(products)}")
-            print("Use without --dry-run to actually update the database")
-        else:
-            # Actually update the database
-            print("Starting product name optimization...")
-            if verbose:
-                print(f"Product IDs: {product_ids}")
-                print(f"Limit: {limit}")
-            
-            result = update_product_names_in_db(product_ids=product_ids, limit=limit)
-            
-            print(f"\nOptimization Results:")
-            print(f"Processed: {result['processed']}")
-            print(f"Successful: {result['successful']}")
-            print(f"Failed: {result['failed']}")
-            
-            if result['errors']:
-                print(f"\nErrors:")
-                for error in result['errors'][:5]:  # Show first 5 errors
-                    print(f"  - {error}")
-                if len(result['errors']) > 5:
-                    print(f"  ... and {len(result['errors']) - 5} more errors")
-            
-            if result['updated_products'] and verbose:
-                print(f"\nUpdated Products:")
-                for product in result['updated_products'][:5]:  # Show first 5
-                    print(f"  {product['product_id']}: {product['optimized_name'][:50]}...")
-                if len(result['updated_products']) > 5:
-                    print(f"  ... and {len(result['updated_products']) - 5} more")
         
-        return 0
+        if len(products) > 10:
+            print(f"... and {len(products) - 10} more products")
+        
+        print(f"\nTotal products to optimize: {len(products)}")
+        print("Use without --dry-run to actually update the database")
     else:
-        # Defer to main.py handlers for the rest to avoid duplication here
-        # For now, return non-zero to indicate not handled
-        return 2
+        # Actually update the database
+        print("Starting product name optimization...")
+        if verbose:
+            print(f"Product IDs: {product_ids}")
+            print(f"Limit: {limit}")
+        
+        result = update_product_names_in_db(product_ids=product_ids, limit=limit)
+        
+        print(f"\nOptimization Results:")
+        print(f"Processed: {result['processed']}")
+        print(f"Successful: {result['successful']}")
+        print(f"Failed: {result['failed']}")
+        
+        if result['errors']:
+            print(f"\nErrors:")
+            for error in result['errors'][:5]:  # Show first 5 errors
+                print(f"  - {error}")
+            if len(result['errors']) > 5:
+                print(f"  ... and {len(result['errors']) - 5} more errors")
+        
+        if result['updated_products'] and verbose:
+            print(f"\nUpdated Products:")
+            for product in result['updated_products'][:5]:  # Show first 5
+                print(f"  {product['product_id']}: {product['optimized_name'][:50]}...")
+            if len(result['updated_products']) > 5:
+                print(f"  ... and {len(result['updated_products']) - 5} more")
+    
+    return 0
+
+
+# Columns kept by `orders/porders --summary`, after the order's sn
+_SUMMARY_FIELDS = ("status", "status_name", "goods_count", "created_at")
 
 
+def _attach_details(args, rows: list[dict], sn_key: str) -> None:
+    """Fetch the detail of every listed (p)order concurrently and store it as row["detail"]."""
+    bulk = get_order_details_bulk if sn_key == "order_sn" else get_porder_details_bulk
+    sns = [str(row[sn_key]) for row in rows if row.get(sn_key)]
+    details = bulk(
+        sns,
+        request_timeout_seconds=args.timeout,
+        max_concurrency=max(1, getattr(args, "detail_concurrency", 8)),
+        app_key=getattr(args, "app_key", None),
+        app_secret=getattr(args, "app_secret", None),
+    )
+    for row in rows:
+        if row.get(sn_key):
+            row["detail"] = _response_data(details.get(str(row[sn_key])), "data")
+
+
+# Seconds a page stored by `orders/porders --prefetch-next` stays usable
+_PREFETCH_TTL = 30
+
+
+def _fetch_list_page(args, page: int) -> dict | None:
+    if args.command == "orders":
+        return get_order_list(page=page, page_size=args.page_size, **_api_kwargs(args, "orders_api_url"))
+    return get_porder_list(
+        page=page,
+        page_size=args.page_size,
+        porder_sn=getattr(args, "porder_sn", None),
+        **_api_kwargs(args, "porders_api_url"),
+    )
+
+
+def _list_cache_key(args, page: int) -> tuple:
+    # Both credentials take part: a page fetched for one account must not be
+    # served to another (the key is hashed, so the secret is not written out).
+    url_attr = "orders_api_url" if args.command == "orders" else "porders_api_url"
+    return (
+        args.command, page, args.page_size, getattr(args, "porder_sn", None),
+        getattr(args, url_attr, None),
+        getattr(args, "app_key", None) or APP_KEY,
+        getattr(args, "app_secret", None) or APP_SECRET,
+    )
+
+
+def _prefetch_list_page(args, page: int) -> None:
+    from .cache import disk_put
+
+    data = _fetch_list_page(args, page)
+    if isinstance(data, dict) and data.get("success", False):
+        disk_put(LIST_CACHE_NAMESPACE, _list_cache_key(args, page), data)
+
+
+def _cmd_order_list(args) -> int:
+    prefetch = getattr(args, "prefetch_next", False)
+    data = None
+    if prefetch:
+        from .cache import disk_get
+
+        data = disk_get(LIST_CACHE_NAMESPACE, _list_cache_key(args, args.page), _PREFETCH_TTL)
+    if data is None:
+        data = _fetch_list_page(args, args.page)
+    if data is None:
+        print(" No data returned.")
+        return 1
+    if not (prefetch and data.get("success", False)):
+        return _print_order_list(args, data)
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Fetch page+1 into the disk cache while this page's details and output are
+    # produced; the pool is joined on return so the page is stored before exit.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(_prefetch_list_page, args, args.page + 1)
+        return _print_order_list(args, data)
+
+
+def _print_order_list(args, data: dict) -> int:
+    sn_key = "order_sn" if args.command == "orders" else "porder_sn"
+    with_detail = getattr(args, "with_detail", False)
+    summary = getattr(args, "summary", False)
+    rows = _response_data(data, "data", "data") if with_detail or summary else None
+    if with_detail and isinstance(rows, list):
+        _attach_details(args, [row for row in rows if isinstance(row, dict)], sn_key)
+    if summary:
+        if not isinstance(rows, list):
+            print(" No rows returned.")
+            return 1
+        keys = (sn_key,) + _SUMMARY_FIELDS
+        getter = operator.itemgetter(*keys)
+        summaries = []
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            try:
+                values = getter(row)
+            except KeyError:
+                values = tuple(row.get(k) for k in keys)
+            summary_row = dict(zip(keys, values))
+            if with_detail:
+                summary_row["detail"] = row.get("detail")
+            summaries.append(summary_row)
+        if getattr(args, "array", False):
+            json_print_array(summaries)
+        else:
+            json_print_many(summaries)
+    else:
+        json_print(data)
+    return 0 if data.get("success", False) else 1
+
+
+def _cmd_clear_cache(args) -> int:
+    from .api_search import clear_detail_cache
+    from .meta import invalidate_reference_caches
+
+    clear_detail_cache()
+    invalidate_reference_caches()
+    invalidate_list_cache()
+    print(" Cache cleared.")
+    return 0
+
+
+# Subcommand name -> handler; each returns the process exit code.
+_COMMANDS = {
+    "search": _cmd_search,
+    "categories": _cmd_categories,
+    "detail": _cmd_detail,
+    "image": _cmd_image,
+    "gui": _cmd_gui,
+    "console": _cmd_console,
+    "logistics": _cmd_logistics,
+    "tags": _cmd_tags,
+    "process-images": _cmd_process_images,
+    "optimize-names": _cmd_optimize_names,
+    "orders": _cmd_order_list,
+    "porders": _cmd_order_list,
+    "clear-cache": _cmd_clear_cache,
+}
+
+
+_LOG_HANDLER = None
+
+
+def _configure_logging(verbose: bool) -> None:
+    """
+    Print the library's warnings (API failures, timeouts) to stderr as bare messages
+    through one handler; --verbose also logs each request from rakumart.http.
+    """
+    import logging
+    import sys
+
+    global _LOG_HANDLER
+    package_logger = logging.getLogger("rakumart")
+    if _LOG_HANDLER is None:
+        _LOG_HANDLER = logging.StreamHandler(sys.stderr)
+        _LOG_HANDLER.setFormatter(logging.Formatter("%(message)s"))
+        package_logger.addHandler(_LOG_HANDLER)
+        package_logger.propagate = False
+    package_logger.setLevel(logging.WARNING)
+    logging.getLogger("rakumart.http").setLevel(logging.DEBUG if verbose else logging.NOTSET)
+
+
+def run(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Search products and fetch product details via API")
+    subparsers = parser.add_subparsers(dest="command", required=False)
+
+    argv = list(argv) if argv is not None else os.sys.argv[1:]
+    first = argv[0] if argv else None
+    if first in ("-h", "--help"):
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+    elif first not in _SUBPARSER_BUILDERS:
+        # Legacy command-less form: resolve the subcommand in one pass over argv
+        argv = [_legacy_command(argv), *argv]
+        first = argv[0]
+    if first in _SUBPARSER_BUILDERS:
+        _SUBPARSER_BUILDERS[first](subparsers)
+
+    args = parser.parse_args(argv)
+
+    if args.command not in ("process-images", "optimize-names"):
+        _configure_logging(getattr(args, "verbose", False))
+
+    handler = _COMMANDS.get(args.command)
+    if handler is None:
+        return 2
+    return handler(args)
@@ -60,4 +60,6 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # Default to a safe, modern instruct-capable model name but allow override
 OPENAI_MODEL = os.getenv("OPENAI_MODEL")
 
-
+# Local cache for slowly-changing reference data (logistics/tags)
+CACHE_DIR = os.getenv("RAKUMART_CACHE_DIR", str(pathlib.Path.home() / ".cache" / "rakumart"))
+META_CACHE_TTL = int(os.getenv("META_CACHE_TTL", "3600"))
@@ -1,6 +1,7 @@
 from typing import Iterable, Optional
 import os
 import json
+import re
 import datetime as dt
 import logging
 from .openai_api import generate_marketing_text
@@ -48,6 +49,9 @@ def _ensure_import() -> None:
         raise RuntimeError(f"psycopg2 not available: {_import_error}")
 
 
+_NON_NUMERIC_RE = re.compile(r"[^0-9.\-]")
+
+
 def _to_numeric(value):
     try:
         if value is None:
@@ -55,8 +59,7 @@ def _to_numeric(value):
         if isinstance(value, (int, float)):
             return float(value)
         s = str(value)
-        import re
-        s = re.sub(r"[^0-9.\-]", "", s)
+        s = _NON_NUMERIC_RE.sub("", s)
         return float(s) if s else None
     except Exception:
         return None
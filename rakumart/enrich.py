@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 
 def enrich_products_with_detail(
@@ -7,36 +8,77 @@ def enrich_products_with_detail(
     shop_type: str,
     request_timeout_seconds: int,
     limit: Optional[int] = None,
+    max_workers: int = 8,
 ) -> None:
     """
     Enrich the given products list in-place by fetching detail for up to `limit` items.
     If limit is None or 0, enrich all items. Missing goodsId are skipped.
     The `get_detail_fn` must be a callable with signature (goods_id, shop_type, request_timeout_seconds, **kwargs).
+    Detail requests are I/O-bound and independent, so up to `max_workers` run concurrently.
     """
-    if not products:
-        return
+    for _ in iter_enriched_products(
+        products,
+        get_detail_fn,
+        shop_type,
+        request_timeout_seconds,
+        limit=limit,
+        max_workers=max_workers,
+    ):
+        pass
 
+
+def iter_enriched_products(
+    products: Iterable[dict],
+    get_detail_fn,
+    shop_type: str,
+    request_timeout_seconds: int,
+    limit: Optional[int] = None,
+    max_workers: int = 8,
+) -> Iterator[dict]:
+    """
+    Same as enrich_products_with_detail, but yield each product (in list order) as soon
+    as its detail has arrived, so callers can print or store it while later fetches
+    are still in flight. `products` may be any iterable (e.g. iter_search_products());
+    detail fetches are submitted as items arrive, overlapping the rest of the response.
+    """
     if limit is None or limit == 0:
-        num_to_enrich = len(products)
+        num_to_enrich = None
     else:
-        num_to_enrich = max(0, min(limit, len(products)))
+        num_to_enrich = max(0, limit)
 
-    for idx in range(num_to_enrich):
-        item = products[idx]
-        goods_id = str(item.get("goodsId", ""))
-        if not goods_id:
-            continue
-        detail = get_detail_fn(
+    def _fetch(key):
+        goods_id, item_shop_type = key
+        return get_detail_fn(
             goods_id=goods_id,
-            shop_type=item.get("shopType", shop_type),
+            shop_type=item_shop_type,
             request_timeout_seconds=request_timeout_seconds,
             normalize=True,
         )
-        if detail:
-            # Preserve existing fields for backward compatibility
-            item["detailImages"] = detail.get("images", [])
-            item["detailDescription"] = detail.get("description", "")
-            # Add normalized payload for richer GUI display
-            item["detailNormalized"] = detail
-
 
+    workers = max_workers if num_to_enrich is None else min(max_workers, num_to_enrich)
+    items = []
+    keys = []
+    # Duplicate goodsIds (e.g. a product promoted twice) are fetched once
+    # and the result is attached to every occurrence.
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for idx, item in enumerate(products):
+            items.append(item)
+            key = None
+            if num_to_enrich is None or idx < num_to_enrich:
+                goods_id = str(item.get("goodsId", ""))
+                if goods_id:
+                    key = (goods_id, item.get("shopType", shop_type))
+                    if key not in futures:
+                        futures[key] = executor.submit(_fetch, key)
+            keys.append(key)
+        for item, key in zip(items, keys):
+            if key is not None:
+                detail = futures[key].result()
+                if detail:
+                    # Preserve existing fields for backward compatibility
+                    item["detailImages"] = detail.get("images", [])
+                    item["detailDescription"] = detail.get("description", "")
+                    # Add normalized payload for richer GUI display
+                    item["detailNormalized"] = detail
+            yield item
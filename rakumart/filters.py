@@ -1,158 +1,185 @@
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
+from collections import Counter
+from functools import partial
 from .utils import get_product_price_in_jpy
 
 
+# Field names tried in priority order for each attribute
+_DIMENSION_KEYS = ("dimensions", "size", "specs")
+_LENGTH_KEYS = ("length", "l", "长")
+_WIDTH_KEYS = ("width", "w", "宽")
+_HEIGHT_KEYS = ("height", "h", "高")
+_INVENTORY_KEYS = ("inventory", "stock", "quantity")
+_DELIVERY_KEYS = ("delivery_days", "shipping_days", "delivery_time")
+_SHIPPING_FEE_KEYS = ("shipping_fee", "shipping_cost", "delivery_fee")
+_WEIGHT_KEYS = ("weight", "product_weight", "net_weight", "gross_weight")
+_CATEGORY_INFO_KEYS = ("category", "categoryInfo")
+_MAIN_CATEGORY_KEYS = ("category", "mainCategory", "一级类目")
+_SUBCATEGORY_KEYS = ("subcategory", "subCategory", "二级类目")
+_SUB_SUBCATEGORY_KEYS = ("subSubcategory", "sub_subcategory", "三级类目")
+
+
+def _first_present(d: dict, keys: tuple) -> Any:
+    """First value under `keys` that is set; 0 counts as set, None and "" do not."""
+    for key in keys:
+        value = d.get(key)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _first_truthy(d: dict, keys: tuple) -> Any:
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return value
+    return None
+
+
+# Per-product predicates: each filter_products_by_* keeps the products its predicate
+# accepts, and apply_product_filters runs all active predicates in one pass.
+
+def _size_ok(product: dict, max_length: Optional[float], max_width: Optional[float],
+             max_height: Optional[float], strict_mode: bool) -> bool:
+    dimensions = _first_truthy(product, _DIMENSION_KEYS) or {}
+    length = _first_present(dimensions, _LENGTH_KEYS)
+    width = _first_present(dimensions, _WIDTH_KEYS)
+    height = _first_present(dimensions, _HEIGHT_KEYS)
+    if strict_mode and (length is None and max_length is not None or
+                        width is None and max_width is not None or
+                        height is None and max_height is not None):
+        return False
+    if max_length is not None and length is not None and float(length) > max_length:
+        return False
+    if max_width is not None and width is not None and float(width) > max_width:
+        return False
+    if max_height is not None and height is not None and float(height) > max_height:
+        return False
+    return True
+
+
+def _inventory_ok(product: dict, min_inventory: int, strict_mode: bool) -> bool:
+    inventory = _first_present(product, _INVENTORY_KEYS)
+    if inventory is None:
+        return not strict_mode
+    try:
+        return int(inventory) >= min_inventory
+    except (TypeError, ValueError):
+        return not strict_mode
+
+
+def _delivery_ok(product: dict, max_delivery_days: int, strict_mode: bool) -> bool:
+    delivery = _first_present(product, _DELIVERY_KEYS)
+    if delivery is None:
+        return not strict_mode
+    try:
+        return int(delivery) <= max_delivery_days
+    except (TypeError, ValueError):
+        return not strict_mode
+
+
+def _shipping_fee_ok(product: dict, max_shipping_fee: float, strict_mode: bool) -> bool:
+    shipping_fee = _first_present(product, _SHIPPING_FEE_KEYS)
+    if shipping_fee is None:
+        return not strict_mode
+    try:
+        return float(shipping_fee) <= float(max_shipping_fee)
+    except (TypeError, ValueError):
+        return not strict_mode
+
+
+def _weight_ok(product: dict, max_weight: float, strict_mode: bool) -> bool:
+    weight = _first_present(product, _WEIGHT_KEYS)
+    if weight is None:
+        return not strict_mode
+    try:
+        return float(weight) <= float(max_weight)
+    except (TypeError, ValueError):
+        return not strict_mode
+
+
+def _jpy_price_ok(product: dict, jpy_price_min: Optional[float], jpy_price_max: Optional[float],
+                  exchange_rate: float, strict_mode: bool) -> bool:
+    jpy_price = get_product_price_in_jpy(product, exchange_rate)
+    if jpy_price is None:
+        return not strict_mode
+    if jpy_price_min and jpy_price < jpy_price_min:
+        return False
+    if jpy_price_max and jpy_price > jpy_price_max:
+        return False
+    return True
+
+
+def _categories_ok(product: dict, categories: Optional[List[str]], subcategories: Optional[List[str]],
+                   sub_subcategories: Optional[List[str]]) -> bool:
+    category_info = _first_truthy(product, _CATEGORY_INFO_KEYS)
+    if not category_info:
+        return True
+    if categories:
+        main_cat = _first_truthy(category_info, _MAIN_CATEGORY_KEYS)
+        if not main_cat or main_cat not in categories:
+            return False
+    if subcategories:
+        sub_cat = _first_truthy(category_info, _SUBCATEGORY_KEYS)
+        if not sub_cat or sub_cat not in subcategories:
+            return False
+    if sub_subcategories:
+        sub_sub_cat = _first_truthy(category_info, _SUB_SUBCATEGORY_KEYS)
+        if not sub_sub_cat or sub_sub_cat not in sub_subcategories:
+            return False
+    return True
+
+
 def filter_products_by_size(products: List[dict], max_length: Optional[float] = None,
                             max_width: Optional[float] = None, max_height: Optional[float] = None,
                             strict_mode: bool = False) -> List[dict]:
-    if not any([max_length, max_width, max_height]):
+    if not (max_length or max_width or max_height):
         return products
-    filtered: List[dict] = []
-    for product in products:
-        dimensions = product.get("dimensions", {}) or product.get("size", {}) or product.get("specs", {})
-        length = dimensions.get("length") or dimensions.get("l") or dimensions.get("长")
-        width = dimensions.get("width") or dimensions.get("w") or dimensions.get("宽")
-        height = dimensions.get("height") or dimensions.get("h") or dimensions.get("高")
-        if strict_mode and (length is None and max_length is not None or
-                            width is None and max_width is not None or
-                            height is None and max_height is not None):
-            continue
-        if max_length is not None and length is not None and float(length) > max_length:
-            continue
-        if max_width is not None and width is not None and float(width) > max_width:
-            continue
-        if max_height is not None and height is not None and float(height) > max_height:
-            continue
-        filtered.append(product)
-    return filtered
+    return [product for product in products if _size_ok(product, max_length, max_width, max_height, strict_mode)]
 
 
 def filter_products_by_inventory(products: List[dict], min_inventory: int,
                                  strict_mode: bool = False) -> List[dict]:
     if not min_inventory:
         return products
-    filtered: List[dict] = []
-    for product in products:
-        inventory = product.get("inventory") or product.get("stock") or product.get("quantity")
-        if inventory is None:
-            if not strict_mode:
-                filtered.append(product)
-            continue
-        try:
-            if int(inventory) >= min_inventory:
-                filtered.append(product)
-        except (TypeError, ValueError):
-            if not strict_mode:
-                filtered.append(product)
-    return filtered
+    return [product for product in products if _inventory_ok(product, min_inventory, strict_mode)]
 
 
 def filter_products_by_delivery(products: List[dict], max_delivery_days: int,
                                 strict_mode: bool = False) -> List[dict]:
     if not max_delivery_days:
         return products
-    filtered: List[dict] = []
-    for product in products:
-        delivery = product.get("delivery_days") or product.get("shipping_days") or product.get("delivery_time")
-        if delivery is None:
-            if not strict_mode:
-                filtered.append(product)
-            continue
-        try:
-            if int(delivery) <= max_delivery_days:
-                filtered.append(product)
-        except (TypeError, ValueError):
-            if not strict_mode:
-                filtered.append(product)
-    return filtered
+    return [product for product in products if _delivery_ok(product, max_delivery_days, strict_mode)]
 
 
 def filter_products_by_shipping_fee(products: List[dict], max_shipping_fee: float,
                                     strict_mode: bool = False) -> List[dict]:
     if not max_shipping_fee and max_shipping_fee != 0:
         return products
-    filtered: List[dict] = []
-    for product in products:
-        shipping_fee = product.get("shipping_fee") or product.get("shipping_cost") or product.get("delivery_fee")
-        if shipping_fee is None:
-            if not strict_mode:
-                filtered.append(product)
-            continue
-        try:
-            if float(shipping_fee) <= float(max_shipping_fee):
-                filtered.append(product)
-        except (TypeError, ValueError):
-            if not strict_mode:
-                filtered.append(product)
-    return filtered
+    return [product for product in products if _shipping_fee_ok(product, max_shipping_fee, strict_mode)]
 
 
 def filter_products_by_weight(products: List[dict], max_weight: float,
                               strict_mode: bool = False) -> List[dict]:
     if not max_weight and max_weight != 0:
         return products
-    filtered: List[dict] = []
-    for product in products:
-        weight = (product.get("weight") or product.get("product_weight") or
-                  product.get("net_weight") or product.get("gross_weight"))
-        if weight is None:
-            if not strict_mode:
-                filtered.append(product)
-            continue
-        try:
-            if float(weight) <= float(max_weight):
-                filtered.append(product)
-        except (TypeError, ValueError):
-            if not strict_mode:
-                filtered.append(product)
-    return filtered
+    return [product for product in products if _weight_ok(product, max_weight, strict_mode)]
 
 
 def filter_products_by_jpy_price(products: List[dict], jpy_price_min: Optional[float] = None,
                                  jpy_price_max: Optional[float] = None, exchange_rate: float = 20.0,
                                  strict_mode: bool = False) -> List[dict]:
-    if not any([jpy_price_min, jpy_price_max]):
+    if not (jpy_price_min or jpy_price_max):
         return products
-    filtered: List[dict] = []
-    for product in products:
-        jpy_price = get_product_price_in_jpy(product, exchange_rate)
-        if jpy_price is None:
-            if not strict_mode:
-                filtered.append(product)
-            continue
-        if jpy_price_min and jpy_price < jpy_price_min:
-            continue
-        if jpy_price_max and jpy_price > jpy_price_max:
-            continue
-        filtered.append(product)
-    return filtered
+    return [product for product in products if _jpy_price_ok(product, jpy_price_min, jpy_price_max, exchange_rate, strict_mode)]
 
 
 def filter_products_by_categories(products: List[dict], categories: Optional[List[str]] = None,
                                   subcategories: Optional[List[str]] = None,
                                   sub_subcategories: Optional[List[str]] = None) -> List[dict]:
-    if not any([categories, subcategories, sub_subcategories]):
+    if not (categories or subcategories or sub_subcategories):
         return products
-    filtered: List[dict] = []
-    for product in products:
-        category_info = product.get("category") or product.get("categoryInfo") or {}
-        if not category_info:
-            filtered.append(product)
-            continue
-        if categories:
-            main_cat = category_info.get("category") or category_info.get("mainCategory") or category_info.get("一级类目")
-            if not main_cat or main_cat not in categories:
-                continue
-        if subcategories:
-            sub_cat = category_info.get("subcategory") or category_info.get("subCategory") or category_info.get("二级类目")
-            if not sub_cat or sub_cat not in subcategories:
-                continue
-        if sub_subcategories:
-            sub_sub_cat = category_info.get("subSubcategory") or category_info.get("sub_subcategory") or category_info.get("三级类目")
-            if not sub_sub_cat or sub_sub_cat not in sub_subcategories:
-                continue
-        filtered.append(product)
-    return filtered
+    return [product for product in products if _categories_ok(product, categories, subcategories, sub_subcategories)]
 
 
 def apply_product_filters(products: List[dict], categories: Optional[List[str]] = None,
@@ -163,45 +190,67 @@ def apply_product_filters(products: List[dict], categories: Optional[List[str]]
                           jpy_price_min: Optional[float] = None, jpy_price_max: Optional[float] = None,
                           exchange_rate: float = 20.0, strict_mode: bool = False,
                           min_inventory: Optional[int] = None, max_delivery_days: Optional[int] = None,
-                          max_shipping_fee: Optional[float] = None) -> List[dict]:
-    filtered_products = products
-    filtered_products = filter_products_by_categories(filtered_products, categories, subcategories, sub_subcategories)
-    filtered_products = filter_products_by_jpy_price(filtered_products, jpy_price_min, jpy_price_max, exchange_rate, strict_mode)
-    filtered_products = filter_products_by_size(filtered_products, max_length, max_width, max_height, strict_mode)
-    if min_inventory is not None:
-        filtered_products = filter_products_by_inventory(filtered_products, min_inventory, strict_mode)
-    if max_delivery_days is not None:
-        filtered_products = filter_products_by_delivery(filtered_products, max_delivery_days, strict_mode)
-    if max_shipping_fee is not None:
-        filtered_products = filter_products_by_shipping_fee(filtered_products, max_shipping_fee, strict_mode)
-    if max_weight is not None:
-        filtered_products = filter_products_by_weight(filtered_products, max_weight, strict_mode)
-    return filtered_products
+                          max_shipping_fee: Optional[float] = None,
+                          api_filtered: bool = False) -> List[dict]:
+    # Same checks, order and activation rules as chaining the filter_products_by_*
+    # functions, but every product is visited once and only one list is built.
+    # api_filtered: the products come from a search that already sent the
+    # category lists to the API, so the category check is skipped.
+    checks: List[Callable[[dict], bool]] = []
+    if not api_filtered and (categories or subcategories or sub_subcategories):
+        checks.append(partial(_categories_ok, categories=categories, subcategories=subcategories,
+                              sub_subcategories=sub_subcategories))
+    if jpy_price_min or jpy_price_max:
+        checks.append(partial(_jpy_price_ok, jpy_price_min=jpy_price_min, jpy_price_max=jpy_price_max,
+                              exchange_rate=exchange_rate, strict_mode=strict_mode))
+    if max_length or max_width or max_height:
+        checks.append(partial(_size_ok, max_length=max_length, max_width=max_width,
+                              max_height=max_height, strict_mode=strict_mode))
+    if min_inventory:
+        checks.append(partial(_inventory_ok, min_inventory=min_inventory, strict_mode=strict_mode))
+    if max_delivery_days:
+        checks.append(partial(_delivery_ok, max_delivery_days=max_delivery_days, strict_mode=strict_mode))
+    if max_shipping_fee is not None and (max_shipping_fee or max_shipping_fee == 0):
+        checks.append(partial(_shipping_fee_ok, max_shipping_fee=max_shipping_fee, strict_mode=strict_mode))
+    if max_weight is not None and (max_weight or max_weight == 0):
+        checks.append(partial(_weight_ok, max_weight=max_weight, strict_mode=strict_mode))
+    if not checks:
+        return products
+    filtered: List[dict] = []
+    for product in products:
+        for check in checks:
+            if not check(product):
+                break
+        else:
+            filtered.append(product)
+    return filtered
 
 
-def collect_categories_from_products(products: List[dict]) -> Dict[str, List[str]]:
-    categories = set()
-    subcategories = set()
-    sub_subcategories = set()
+def count_categories_from_products(products: List[dict]) -> Dict[str, Dict[str, int]]:
+    """Per level ("categories", "subcategories", "sub_subcategories"): {name: product count}, sorted by name."""
+    categories: Counter = Counter()
+    subcategories: Counter = Counter()
+    sub_subcategories: Counter = Counter()
     for product in products:
-        category_info = product.get("category") or product.get("categoryInfo") or {}
+        category_info = _first_truthy(product, _CATEGORY_INFO_KEYS) or {}
         if isinstance(category_info, dict):
-            main_cat = category_info.get("category") or category_info.get("mainCategory") or category_info.get("一级类目")
+            main_cat = _first_truthy(category_info, _MAIN_CATEGORY_KEYS)
             if main_cat:
-                categories.add(main_cat)
-            sub_cat = category_info.get("subcategory") or category_info.get("subCategory") or category_info.get("二级类目")
+                categories[main_cat] += 1
+            sub_cat = _first_truthy(category_info, _SUBCATEGORY_KEYS)
             if sub_cat:
-                subcategories.add(sub_cat)
-            sub_sub_cat = category_info.get("subSubcategory") or category_info.get("sub_subcategory") or category_info.get("三级类目")
+                subcategories[sub_cat] += 1
+            sub_sub_cat = _first_truthy(category_info, _SUB_SUBCATEGORY_KEYS)
             if sub_sub_cat:
-                sub_subcategories.add(sub_sub_cat)
+                sub_subcategories[sub_sub_cat] += 1
         elif isinstance(category_info, str):
-            categories.add(category_info)
+            categories[category_info] += 1
     return {
-        "categories": sorted(list(categories)),
-        "subcategories": sorted(list(subcategories)),
-        "sub_subcategories": sorted(list(sub_subcategories)),
+        "categories": dict(sorted(categories.items())),
+        "subcategories": dict(sorted(subcategories.items())),
+        "sub_subcategories": dict(sorted(sub_subcategories.items())),
     }
 
 
-
+def collect_categories_from_products(products: List[dict]) -> Dict[str, List[str]]:
+    return {level: list(counts) for level, counts in count_categories_from_products(products).items()}
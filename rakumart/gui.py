@@ -9,12 +9,17 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
         print(" Tkinter is not available in this Python installation.")
         raise SystemExit(1)
 
+    import atexit
+    import hashlib
+    import os
+    import threading
     import webbrowser
     import tempfile
 
     from .api_search import search_products, get_product_detail
     from .db import save_products_to_db, reset_products_clean_table, fix_products_clean_schema
-    from .enrich import enrich_products_with_detail
+    from .enrich import iter_enriched_products
+    from .http import clear_response_cache
     from .product_optimizer import update_product_names_in_db, get_products_needing_optimization, ProductNameOptimizer
 
     root = tk.Tk()
@@ -107,7 +112,17 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
     strict_mode_var = tk.BooleanVar(value=False)
     ttk.Checkbutton(filter_frame, text="厳密フィルタリング (すべての条件を満たす商品のみ)", variable=strict_mode_var).pack(pady=4)
 
-    def do_search():
+    search_state = {"running": False}
+
+    # Search pages are reused from the API response cache for this long, so paging
+    # back or re-applying client-side filters skips the request; リロード clears it.
+    search_cache_ttl = 600
+
+    def do_search(on_done=None):
+        # Network work runs on a worker thread; Tk widgets are only touched
+        # from the mainloop via root.after.
+        if search_state["running"]:
+            return
         try:
             price_min = price_min_var.get().strip() or None
             price_max = price_max_var.get().strip() or None
@@ -122,11 +137,27 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
             min_inventory = int(min_inventory_var.get()) if min_inventory_var.get().strip() else None
             max_delivery_days = int(max_delivery_var.get()) if max_delivery_var.get().strip() else None
             max_shipping_fee = float(max_shipping_var.get()) if max_shipping_var.get().strip() else None
+            keyword = keyword_var.get().strip()
+            page = page_var.get()
+            page_size = size_var.get()
+            with_detail = enrich_var.get()
+        except Exception as e:
+            messagebox.showerror("エラー", f"検索に失敗しました: {e}")
+            return
 
-            products = search_products(
-                keyword_var.get().strip(),
-                page=page_var.get(),
-                page_size=size_var.get(),
+        def _worker():
+            try:
+                products = _fetch()
+            except Exception as e:
+                root.after(0, _fail, e)
+            else:
+                root.after(0, _apply, products)
+
+        def _search():
+            return search_products(
+                keyword,
+                page=page,
+                page_size=page_size,
                 price_min=price_min,
                 price_max=price_max,
                 jpy_price_min=jpy_price_min,
@@ -142,27 +173,58 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
                 max_shipping_fee=max_shipping_fee,
                 request_timeout_seconds=timeout,
                 shop_type=shop_type,
+                cache_ttl=search_cache_ttl,
             )
-        except Exception as e:
+
+        def _fetch():
+            products = _search()
+            if with_detail and products:
+                total = len(products)
+                root.after(0, _progress, 0, total)
+                for done, _ in enumerate(iter_enriched_products(
+                    products,
+                    get_detail_fn=lambda **kwargs: get_product_detail(
+                        goods_id=kwargs.get("goods_id"),
+                        shop_type=kwargs.get("shop_type"),
+                        request_timeout_seconds=kwargs.get("request_timeout_seconds"),
+                    ),
+                    shop_type=shop_type,
+                    request_timeout_seconds=timeout,
+                    limit=0,
+                ), 1):
+                    root.after(0, _progress, done, total)
+            return products
+
+        def _progress(done, total):
+            progress_bar.configure(maximum=max(1, total), value=done)
+
+        def _fail(e):
+            search_state["running"] = False
+            progress_bar.configure(value=0)
+            root.config(cursor="")
             messagebox.showerror("エラー", f"検索に失敗しました: {e}")
-            return
 
-        if enrich_var.get():
-            enrich_products_with_detail(
-                products,
-                get_detail_fn=lambda **kwargs: get_product_detail(
-                    goods_id=kwargs.get("goods_id"),
-                    shop_type=kwargs.get("shop_type"),
-                    request_timeout_seconds=kwargs.get("request_timeout_seconds"),
-                ),
-                shop_type=shop_type,
-                request_timeout_seconds=timeout,
-                limit=0,
-            )
+        def _apply(products):
+            search_state["running"] = False
+            root.config(cursor="")
+            _show_results(products)
+            if on_done is not None:
+                on_done()
+
+        search_state["running"] = True
+        root.config(cursor="watch")
+        threading.Thread(target=_worker, daemon=True).start()
 
-        for row in tree.get_children():
-            tree.delete(row)
+    def _show_results(products):
+        rows = []
+        seen_iids = set()
         for item in products:
+            iid = str(item.get("goodsId", ""))
+            if iid in seen_iids:
+                # Treeview iids must be unique; a goodsId listed twice would
+                # abort the whole batch insert with a TclError.
+                continue
+            seen_iids.add(iid)
             shop_info = item.get("shopInfo", {})
             shop_name = shop_info.get("shopName", "") if isinstance(shop_info, dict) else ""
             repurchase_rate = f"{item.get('repurchaseRate', 'N/A')}%"
@@ -171,7 +233,7 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
             create_date = item.get('createDate', 'N/A')
             if create_date != 'N/A' and len(create_date) > 10:
                 create_date = create_date[:10]
-            tree.insert("", tk.END, iid=str(item.get("goodsId", "")), values=(
+            rows.append((iid, (
                 item.get("goodsId", ""),
                 item.get("titleC", ""),
                 item.get("titleT", ""),
@@ -182,7 +244,18 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
                 trade_score,
                 category,
                 create_date,
-            ))
+            )))
+
+        # One delete call and hidden columns while inserting: Tk lays the
+        # table out once instead of after every row.
+        tree.delete(*tree.get_children())
+        tree["displaycolumns"] = ()
+        try:
+            for iid, values in rows:
+                tree.insert("", tk.END, iid=iid, values=values)
+        finally:
+            tree["displaycolumns"] = cols
+        tree.update_idletasks()
 
         nonlocal_data.clear()
         for p in products:
@@ -213,6 +286,18 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
 
     ttk.Button(controls, text="検索", command=do_search).pack(side=tk.LEFT, padx=6)
 
+    def reload_search():
+        if search_state["running"]:
+            return
+        clear_response_cache()
+        enhanced_do_search()
+
+    ttk.Button(controls, text="リロード", command=reload_search).pack(side=tk.LEFT, padx=2)
+
+    # Detail enrichment progress (products enriched so far / page size)
+    progress_bar = ttk.Progressbar(controls, mode="determinate", length=120)
+    progress_bar.pack(side=tk.LEFT, padx=6)
+
     control_frame2 = ttk.Frame(controls)
     control_frame2.pack(fill=tk.X, pady=4)
 
@@ -312,8 +397,7 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
         stats_text.insert(tk.END, stats_info)
 
     def enhanced_do_search():
-        do_search()
-        update_stats()
+        do_search(on_done=update_stats)
 
     for widget in controls.winfo_children():
         if isinstance(widget, ttk.Button) and widget.cget('text') == '検索':
@@ -368,6 +452,18 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
             except Exception:
                 pass
 
+    # Description page written per distinct HTML (sha1 -> temp path), removed at exit
+    desc_paths = {}
+
+    def _remove_desc_files():
+        for path in desc_paths.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    atexit.register(_remove_desc_files)
+
     def open_description():
         sel = tree.selection()
         if not sel:
@@ -376,10 +472,18 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
         if not item:
             return
         html = item.get("detailDescription") or "<p>No description</p>"
+        # Declare the charset so the browser doesn't have to sniff it, and
+        # encode once into a single binary write.
+        page = f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{html}</body></html>'
+        data = page.encode("utf-8", "replace")
+        digest = hashlib.sha1(data, usedforsecurity=False).hexdigest()
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as f:
-                f.write(html)
-                path = f.name
+            path = desc_paths.get(digest)
+            if path is None or not os.path.exists(path):
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="wb") as f:
+                    f.write(data)
+                    path = f.name
+                desc_paths[digest] = path
             webbrowser.open(path)
         except Exception as e:
             messagebox.showerror("エラー", f"説明の表示に失敗しました: {e}")
@@ -571,7 +675,6 @@ def run_gui(shop_type: str = "1688", timeout: int = 15, detail_limit: int = 5) -
                     close_btn.pack(pady=10)
             
             # Run optimization in a separate thread to avoid blocking GUI
-            import threading
             thread = threading.Thread(target=run_optimization)
             thread.daemon = True
             thread.start()
@@ -1,27 +1,525 @@
-from typing import Optional, Dict, Any
-import requests
+from typing import Optional, Dict, Any, Callable, Hashable, Iterable, Iterator, TypeVar, Union, TYPE_CHECKING
+import atexit
+import copy
+import json
+import logging
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .config import (
+    APP_KEY,
+    APP_SECRET,
+    API_URL,
+    DETAIL_API_URL,
+    ORDER_LIST_API_URL,
+    CREATE_ORDER_API_URL,
+    UPDATE_ORDER_STATUS_API_URL,
+    CANCEL_ORDER_API_URL,
+    CREATE_PORDER_API_URL,
+    UPDATE_PORDER_STATUS_API_URL,
+    CANCEL_PORDER_API_URL,
+)
+from .sign import signed_params
+from .utils import dig
+from .printing import json_dumps_pretty
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+_K = TypeVar("_K", bound=Hashable)
+_R = TypeVar("_R")
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+ujson = None  # type: ignore
+if orjson is None:
+    try:
+        import ujson  # type: ignore
+    except Exception:  # pragma: no cover
+        pass
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore
+
+# orjson parses straight from bytes and is several times faster than stdlib json
+# (ujson is the next best C parser when only it is installed; both accept bytes)
+if orjson is not None:
+    _loads = orjson.loads
+elif ujson is not None:
+    _loads = ujson.loads
+else:
+    _loads = json.loads
+
+
+# One pooled session for every API call: the Rakumart endpoints all live on the
+# same host, so keep-alive saves a TCP+TLS handshake per request after the first.
+# requests is imported on first use so short CLI runs (--help, gui start-up) skip it.
+_SESSION: Optional["requests.Session"] = None
+_SESSION_LOCK = threading.Lock()
+
+
+# Every endpoint normally lives on one host; give it a dedicated pool sized for the
+# bulk helpers' fan-out so concurrent calls reuse connections instead of spilling.
+_API_ORIGINS = tuple(
+    dict.fromkeys(
+        f"{parts.scheme}://{parts.netloc}"
+        for parts in map(
+            urlsplit,
+            (
+                API_URL,
+                DETAIL_API_URL,
+                ORDER_LIST_API_URL,
+                CREATE_ORDER_API_URL,
+                UPDATE_ORDER_STATUS_API_URL,
+                CANCEL_ORDER_API_URL,
+                CREATE_PORDER_API_URL,
+                UPDATE_PORDER_STATUS_API_URL,
+                CANCEL_PORDER_API_URL,
+            ),
+        )
+        if parts.scheme and parts.netloc
+    )
+)
+_API_POOL_MAXSIZE = 32
+
+# Longest Retry-After the client honours; a larger value would stall a worker
+# (or the GUI) for minutes, so the wait is capped and the retry budget does the rest.
+_RETRY_AFTER_MAX = 10.0
+
+
+def _make_retry(**kwargs: Any):
+    from urllib3.util.retry import Retry
+
+    class _CappedRetry(Retry):
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            return None if retry_after is None else min(retry_after, _RETRY_AFTER_MAX)
+
+    kwargs.setdefault("backoff_factor", 0.3)
+    kwargs.setdefault("respect_retry_after_header", True)
+    kwargs.setdefault("raise_on_status", False)
+    try:
+        # Jitter spreads out retries from concurrent workers (urllib3 >= 2)
+        return _CappedRetry(backoff_jitter=0.2, **kwargs)
+    except TypeError:
+        return _CappedRetry(**kwargs)
+
+
+def _build_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # Ask for every encoding urllib3 can decode here: gzip/deflate always, plus
+    # br/zstd when brotli/zstandard are installed. Listing responses are verbose
+    # JSON and shrink several-fold on the wire.
+    from urllib3.util import make_headers
+
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    # Every endpoint answers JSON; say so once here rather than per request
+    session.headers["Accept"] = "application/json"
+    session.headers["User-Agent"] = f"rakumart-1688-client {session.headers.get('User-Agent', '')}".rstrip()
+    # urllib3 retries connect errors for any method (nothing was sent) but read
+    # errors and bad statuses only for GET. API POSTs get their per-call policy
+    # in _post, which knows whether the call is safe to replay.
+    retry = dict(total=4, connect=3, read=3, status=3, status_forcelist=(429, 500, 502, 503, 504))
+    default_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_make_retry(**retry))
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+    api_adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_API_POOL_MAXSIZE,
+        max_retries=_make_retry(**retry),
+    )
+    for origin in _API_ORIGINS:
+        session.mount(origin, api_adapter)
+    return session
+
+
+def _resolve_api_hosts() -> None:
+    for origin in _API_ORIGINS:
+        parts = urlsplit(origin)
+        try:
+            socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        except (OSError, UnicodeError):
+            pass
+
+
+def get_session() -> "requests.Session":
+    """Return the shared session, creating it on first use (thread-safe)."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                # Look the API host up while requests is still importing, so a
+                # caching resolver has the answer before the first connect.
+                threading.Thread(target=_resolve_api_hosts, daemon=True).start()
+                session = _build_session()
+                atexit.register(session.close)
+                _SESSION = session
+    return _SESSION
+
+
+def set_session(session: Optional["requests.Session"]) -> None:
+    """
+    Replace the shared session used by every API helper (e.g. to add proxies, auth or
+    custom adapters). Pass None to drop it; a default one is recreated on next use.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        _SESSION = session
+
+
+# Percent-encoding inflates long base64 values (image uploads) by ~10%, so
+# forms carrying one stay multipart.
+_URLENCODE_MAX_VALUE = 4096
+
+
+def _as_form_fields(files: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return {name: value} when every part is a short plain text field ((None, value)
+    tuples), i.e. nothing is actually uploaded; None otherwise.
+    """
+    fields: Dict[str, Any] = {}
+    for name, part in files.items():
+        if not (isinstance(part, tuple) and len(part) == 2 and part[0] is None):
+            return None
+        value = part[1]
+        if value is not None and not isinstance(value, (str, bytes, int, float)):
+            return None
+        if isinstance(value, (str, bytes)) and len(value) > _URLENCODE_MAX_VALUE:
+            return None
+        fields[name] = value
+    return fields
+
+
+# Retried for every call: 429 means the server refused the request unprocessed
+_RETRY_ALWAYS = frozenset({429})
+# Retried only for idempotent calls: after these the server may already have acted
+_RETRY_IF_IDEMPOTENT = frozenset({500, 502, 503, 504})
+_POST_RETRIES = 3
+_POST_BACKOFF = 0.3
+
+
+def _retry_delay(attempt: int, resp: Optional["requests.Response"] = None) -> float:
+    delay = _POST_BACKOFF * (2 ** attempt) * (1 + 0.2 * random.random())
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form: keep the backoff
+    return min(delay, _RETRY_AFTER_MAX)
+
+
+def _rewind_files(files: Optional[Dict[str, Any]]) -> None:
+    for part in (files or {}).values():
+        fp = part[1] if isinstance(part, tuple) else part
+        if hasattr(fp, "seek"):
+            fp.seek(0)
+
+
+def _post(
+    url: str,
+    *,
+    data: Union[Dict[str, Any], bytes, None],
+    files: Optional[Dict[str, Any]],
+    timeout: int,
+    session: Optional["requests.Session"],
+    idempotent: bool,
+    stream: bool = False,
+) -> "requests.Response":
+    """
+    session.post with the retry policy chosen per call: 429 is retried for every call;
+    timeouts, dropped connections and 5xx only when `idempotent`, since a create or
+    cancel may already have been applied. Raises like requests on final failure.
+    """
+    import requests
+
+    session = session or get_session()
+    for attempt in range(_POST_RETRIES + 1):
+        last = attempt == _POST_RETRIES
+        if attempt:
+            _rewind_files(files)
+        try:
+            resp = session.post(url, data=data, files=files, timeout=timeout, stream=stream)
+        except (requests.ReadTimeout, requests.ConnectionError) as exc:
+            # Connect timeouts were already retried by the adapter
+            if last or not idempotent or isinstance(exc, requests.ConnectTimeout):
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        status = resp.status_code
+        if not last and (status in _RETRY_ALWAYS or (idempotent and status in _RETRY_IF_IDEMPOTENT)):
+            resp.close()
+            time.sleep(_retry_delay(attempt, resp))
+            continue
+        try:
+            resp.raise_for_status()
+        except requests.HTTPError:
+            resp.close()
+            raise
+        return resp
+    raise AssertionError("unreachable")
 
 
 def safe_post_json(
     url: str,
     *,
-    data: Optional[Dict[str, Any]] = None,
+    data: Union[Dict[str, Any], bytes, None] = None,
     files: Optional[Dict[str, Any]] = None,
     timeout: int = 15,
+    session: Optional["requests.Session"] = None,
+    idempotent: bool = True,
 ) -> Optional[Dict[str, Any]]:
+    import requests
+
+    if files and data is None:
+        # Text-only forms go out urlencoded: no multipart boundary generation
+        # and a smaller body. Real uploads (create_porder files) stay multipart.
+        fields = _as_form_fields(files)
+        if fields is not None:
+            data, files = fields, None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(" POST %s %s", url, data if files is None else sorted(files))
     try:
-        resp = requests.post(url, data=data, files=files, timeout=timeout)
-        resp.raise_for_status()
+        resp = _post(url, data=data, files=files, timeout=timeout, session=session, idempotent=idempotent)
     except requests.Timeout:
-        print(f" Request to {url} timed out after {timeout}s")
+        logger.warning(" Request to %s timed out after %ss", url, timeout)
         return None
     except requests.RequestException as exc:
-        print(f" Network error calling {url}: {exc}")
+        logger.warning(" Network error calling %s: %s", url, exc)
         return None
     try:
-        return resp.json()
+        return _loads(resp.content)
     except ValueError:
-        print(" Failed to parse JSON from response")
+        logger.warning(" Failed to parse JSON from response")
         return None
 
 
+def _signed_payload(
+    fields: Optional[Dict[str, Any]], app_key: Optional[str], app_secret: Optional[str], reuse_sign: bool = True
+) -> Dict[str, Any]:
+    resolved_app_key = app_key or APP_KEY
+    timestamp, sign = signed_params(resolved_app_key, app_secret or APP_SECRET, reuse=reuse_sign)
+    payload: Dict[str, Any] = {"app_key": resolved_app_key, "timestamp": timestamp, "sign": sign}
+    if fields:
+        payload.update(fields)
+    return payload
+
+
+# Short-lived cache of successful read-only responses, keyed by endpoint,
+# credentials and fields (never the timestamp/sign). Opt-in per call via cache_ttl.
+_RESPONSE_CACHE: Dict[Any, Any] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_MAX = 256
+
+
+def clear_response_cache() -> None:
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.clear()
+
+
+_KEYABLE = (str, bytes, int, float, type(None))
+
+
+def _content_key(parts: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Hashable by-value key for form fields or upload parts, or None when a value
+    (a file object, a list, ...) cannot be keyed on its content.
+    """
+    items = []
+    for name, value in sorted(parts.items()):
+        values = value if isinstance(value, tuple) else (value,)
+        if not all(isinstance(v, _KEYABLE) for v in values):
+            return None
+        items.append((name, value))
+    return tuple(items)
+
+
+def api_call(
+    url: str,
+    fields: Optional[Dict[str, Any]] = None,
+    *,
+    files: Optional[Dict[str, Any]] = None,
+    timeout: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
+    cache_ttl: float = 0,
+    idempotent: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Signed POST to a Rakumart open API endpoint: prepends app_key/timestamp/sign to
+    `fields` and returns the parsed JSON (or None on transport/parse errors).
+    `files` holds upload parts only; when given, the request goes out as multipart.
+    With cache_ttl > 0 a successful response for the same url/credentials/fields
+    and text upload parts (e.g. an image's base64) is reused for that many seconds
+    (read-only endpoints only); calls uploading file objects are never cached. Calls that create or change state pass idempotent=False so a
+    5xx or timeout is reported instead of replayed, and they are signed afresh.
+    """
+    cache_key = None
+    if cache_ttl > 0:
+        field_key = _content_key(fields or {})
+        files_key = _content_key(files or {})
+        if field_key is not None and files_key is not None:
+            cache_key = (url, app_key or APP_KEY, field_key, files_key)
+    if cache_key is not None:
+        now = time.monotonic()
+        with _RESPONSE_CACHE_LOCK:
+            hit = _RESPONSE_CACHE.get(cache_key)
+        if hit is not None and hit[0] > now:
+            # Callers (e.g. enrichment) edit results in place; never hand out the stored object
+            return copy.deepcopy(hit[1])
+    payload = _signed_payload(fields, app_key, app_secret, reuse_sign=idempotent)
+    if files:
+        parts = {name: (None, value) for name, value in payload.items()}
+        parts.update(files)
+        data = safe_post_json(url, files=parts, timeout=timeout, session=session, idempotent=idempotent)
+    else:
+        data = safe_post_json(url, data=payload, timeout=timeout, session=session, idempotent=idempotent)
+    if cache_key is not None and isinstance(data, dict) and data.get("success", False):
+        with _RESPONSE_CACHE_LOCK:
+            if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+                _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+            _RESPONSE_CACHE[cache_key] = (time.monotonic() + cache_ttl, copy.deepcopy(data))
+    return data
+
+
+_MISSING = object()
+
+
+def _report_failure(label: str, data: Any) -> None:
+    logger.warning(" %s%s failed: %s", label[:1].upper(), label[1:], data)
+
+
+def api_result(data: Optional[Dict[str, Any]], label: str, *keys: str, default: Any = None) -> Any:
+    """
+    Unwrap a parsed API response: return the value at `keys` (e.g. "data") when the
+    call succeeded, otherwise report why (using `label`, e.g. "detail API") and
+    return `default`. None (transport/parse error, already reported) gives `default`.
+    """
+    if data is None:
+        return default
+    if not data.get("success", False):
+        _report_failure(label, data)
+        return default
+    result = dig(data, *keys, default=_MISSING)
+    if result is _MISSING:
+        logger.warning(" Unexpected %s response structure (--verbose shows the payload)", label)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json_dumps_pretty(data))
+        return default
+    return result
+
+
+def can_stream_json() -> bool:
+    return ijson is not None
+
+
+# ijson events that carry a value (as opposed to start/end of a map or array)
+_SCALAR_EVENTS = frozenset({"null", "boolean", "integer", "double", "number", "string"})
+
+
+def iter_post_json_items(
+    url: str,
+    prefix: str,
+    *,
+    data: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, Any]] = None,
+    timeout: int = 15,
+    session: Optional["requests.Session"] = None,
+    label: str = "API",
+) -> Iterator[Any]:
+    """
+    Yield the elements of the JSON array at `prefix` (ijson path, e.g. "data.result.result")
+    while the response body is still being received. Requires ijson; check can_stream_json().
+    Failures are reported like api_result: a false `success` logs the top-level
+    fields (msg, code, ...) under `label`, and a missing array logs an unexpected structure.
+    """
+    if ijson is None:
+        raise RuntimeError("ijson is not installed")
+    import requests
+
+    envelope: Dict[str, Any] = {}
+    seen = False
+
+    def track(events: Iterator[Any]) -> Iterator[Any]:
+        # Keep the top-level scalars (success, msg, ...) and note whether the
+        # array was present, without holding on to anything else.
+        nonlocal seen
+        for event in events:
+            path, kind, value = event
+            if path == prefix:
+                seen = True
+            elif kind in _SCALAR_EVENTS and path and "." not in path:
+                envelope[path] = value
+            yield event
+
+    try:
+        with _post(url, data=data, files=files, timeout=timeout, session=session, idempotent=True, stream=True) as resp:
+            resp.raw.decode_content = True
+            yield from ijson.items(track(ijson.parse(resp.raw)), f"{prefix}.item")
+    except requests.Timeout:
+        logger.warning(" Request to %s timed out after %ss", url, timeout)
+    except requests.RequestException as exc:
+        logger.warning(" Network error calling %s: %s", url, exc)
+    except ijson.JSONError:
+        logger.warning(" Failed to parse JSON from response")
+    else:
+        if not envelope.get("success", False):
+            _report_failure(label, envelope)
+        elif not seen:
+            logger.warning(" Unexpected %s response structure", label)
+
+
+def map_concurrent(fn: Callable[[_K], _R], keys: Iterable[_K], max_workers: int = 16) -> Dict[_K, _R]:
+    """
+    Call `fn(key)` for every distinct key on a thread pool and return {key: result} in
+    input order. The calls are I/O-bound on the shared session, whose connection pool
+    is thread-safe, so wall time is roughly the slowest call rather than the sum.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return {}
+    workers = max(1, min(max_workers, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique, executor.map(fn, unique)))
+
+
+def iter_api_items(
+    url: str,
+    prefix: str,
+    fields: Optional[Dict[str, Any]] = None,
+    *,
+    timeout: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
+    label: str = "API",
+) -> Iterator[Any]:
+    """
+    Signed POST like api_call, yielding the elements of the array at `prefix` (dotted
+    path, e.g. "data.data") as they are parsed. Without ijson the whole response is
+    parsed first and the array is looked up from it. Failures are reported under
+    `label` as api_result does.
+    """
+    payload = _signed_payload(fields, app_key, app_secret)
+    if ijson is not None:
+        yield from iter_post_json_items(url, prefix, data=payload, timeout=timeout, session=session, label=label)
+        return
+    items = api_result(safe_post_json(url, data=payload, timeout=timeout, session=session), label, *prefix.split("."))
+    if isinstance(items, list):
+        yield from items
@@ -1,16 +1,64 @@
-from typing import Optional
+from typing import Optional, Dict, Tuple, TYPE_CHECKING
+import threading
 import time
-import json
-import requests
-from .http import safe_post_json
+from .cache import disk_clear, disk_get, disk_put
+from .http import api_call
 
-from .config import LOGISTICS_API_URL, TAGS_API_URL, APP_KEY, APP_SECRET
-from .sign import md5_sign
+from .config import LOGISTICS_API_URL, TAGS_API_URL, APP_KEY, META_CACHE_TTL
 
+if TYPE_CHECKING:  # requests is imported lazily by .http
+    import requests
 
-def _sign(app_key: str, app_secret: str, timestamp: str) -> str:
-    # The existing meta endpoints align with md5 signature style in main.py
-    return md5_sign(app_key, app_secret, timestamp)
+
+# Logistics and tag lists change rarely, so successful responses are kept in
+# memory and on disk (shared across CLI runs) for META_CACHE_TTL seconds.
+_META_CACHE: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+_META_CACHE_LOCK = threading.Lock()
+_DISK_NAMESPACE = "meta"
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[dict]:
+    with _META_CACHE_LOCK:
+        hit = _META_CACHE.get(key)
+    if hit is not None and time.time() - hit[0] < META_CACHE_TTL:
+        return hit[1]
+    data = disk_get(_DISK_NAMESPACE, key, META_CACHE_TTL)
+    if data is not None:
+        with _META_CACHE_LOCK:
+            _META_CACHE[key] = (time.time(), data)
+    return data
+
+
+def _cache_put(key: Tuple[str, str], data: dict) -> None:
+    with _META_CACHE_LOCK:
+        _META_CACHE[key] = (time.time(), data)
+    disk_put(_DISK_NAMESPACE, key, data)
+
+
+def invalidate_reference_caches() -> None:
+    """Drop cached logistics/tags responses from memory and disk."""
+    with _META_CACHE_LOCK:
+        _META_CACHE.clear()
+    disk_clear(_DISK_NAMESPACE)
+
+
+def _cached_call(
+    url: str,
+    request_timeout_seconds: int,
+    app_key: Optional[str],
+    app_secret: Optional[str],
+    use_cache: bool,
+    session: Optional["requests.Session"] = None,
+) -> Optional[dict]:
+    key = (url, app_key or APP_KEY or "")
+    if use_cache:
+        data = _cache_get(key)
+        if data is not None:
+            return data
+    data = api_call(url, timeout=request_timeout_seconds, app_key=app_key, app_secret=app_secret, session=session)
+    if isinstance(data, dict) and data.get("success", False):
+        _cache_put(key, data)
+    return data
 
 
 def get_logistics(
@@ -18,18 +66,10 @@ def get_logistics(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    use_cache: bool = True,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    ak = app_key or APP_KEY
-    sk = app_secret or APP_SECRET
-    url = api_url or LOGISTICS_API_URL
-    sign = _sign(ak, sk, timestamp)
-    files = {
-        "app_key": (None, ak),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-    }
-    return safe_post_json(url, files=files, timeout=request_timeout_seconds)
+    return _cached_call(api_url or LOGISTICS_API_URL, request_timeout_seconds, app_key, app_secret, use_cache, session)
 
 
 def get_tags(
@@ -37,17 +77,7 @@ def get_tags(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    use_cache: bool = True,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    ak = app_key or APP_KEY
-    sk = app_secret or APP_SECRET
-    url = api_url or TAGS_API_URL
-    sign = _sign(ak, sk, timestamp)
-    files = {
-        "app_key": (None, ak),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-    }
-    return safe_post_json(url, files=files, timeout=request_timeout_seconds)
-
-
+    return _cached_call(api_url or TAGS_API_URL, request_timeout_seconds, app_key, app_secret, use_cache, session)
@@ -1,12 +1,11 @@
-from typing import List, Optional, Dict, Any
-import time
+from typing import List, Optional, Dict, Any, Iterator, TYPE_CHECKING
+import contextlib
+import logging
 import os
-import requests
-from .http import safe_post_json
+from .cache import disk_clear
+from .http import api_call, api_result, clear_response_cache, iter_api_items, map_concurrent
 
 from .config import (
-    APP_KEY,
-    APP_SECRET,
     CREATE_ORDER_API_URL,
     UPDATE_ORDER_STATUS_API_URL,
     CANCEL_ORDER_API_URL,
@@ -20,11 +19,86 @@ from .config import (
     PORDER_DETAIL_API_URL,
     LOGISTICS_TRACK_API_URL,
 )
-from .sign import md5_sign
 
+if TYPE_CHECKING:  # requests is imported lazily by .http
+    import requests
 
-def generate_sign(app_key: str, app_secret: str, timestamp: str) -> str:
-    return md5_sign(app_key, app_secret, timestamp)
+logger = logging.getLogger(__name__)
+
+# Disk-cache namespace of prefetched order/porder list pages (see the CLI's
+# --prefetch-next); any call that changes an order drops them.
+LIST_CACHE_NAMESPACE = "lists"
+
+
+def invalidate_list_cache() -> None:
+    disk_clear(LIST_CACHE_NAMESPACE)
+
+
+def _mutating_call(url: str, fields: Dict[str, Any], **kwargs: Any) -> Optional[dict]:
+    """
+    api_call for endpoints that change state: never replayed on 5xx/timeouts, and
+    cached responses and list pages are dropped afterwards, even on failure (the
+    server may have acted).
+    """
+    try:
+        return api_call(url, fields, idempotent=False, **kwargs)
+    finally:
+        clear_response_cache()
+        invalidate_list_cache()
+
+
+_GOOD_KEY = "goods[%d][%s]"
+_GOOD_SUB_KEY = "goods[%d][%s][%d][%s]"
+_GOOD_OPTIONAL = ("pic", "remark", "fba", "asin")
+_GOOD_NAMES = ("link", "price", "num") + _GOOD_OPTIONAL
+
+# Form keys for goods[i][...] are identical across orders, so they are formatted
+# once per index and reused; the table grows on demand up to _GOOD_KEYS_MAX rows.
+_GOOD_KEYS_MAX = 256
+_GOOD_KEYS: List[Dict[str, str]] = []
+_GOOD_SUB_KEYS: Dict[tuple, str] = {}
+
+
+def _good_keys(i: int) -> Dict[str, str]:
+    if i < len(_GOOD_KEYS):
+        return _GOOD_KEYS[i]
+    keys = {name: _GOOD_KEY % (i, name) for name in _GOOD_NAMES}
+    if i == len(_GOOD_KEYS) and i < _GOOD_KEYS_MAX:
+        _GOOD_KEYS.append(keys)
+    return keys
+
+
+def _good_sub_key(i: int, group: str, j: int, name: str) -> str:
+    key = (i, group, j, name)
+    cached = _GOOD_SUB_KEYS.get(key)
+    if cached is None:
+        cached = _GOOD_SUB_KEY % key
+        if i < _GOOD_KEYS_MAX and j < 16:
+            _GOOD_SUB_KEYS[key] = cached
+    return cached
+
+
+def _iter_goods_fields(goods: List[dict]):
+    """Yield (form key, value) pairs for create_order's goods[i][...] fields."""
+    for i, good in enumerate(goods):
+        keys = _good_keys(i)
+        yield keys["link"], good["link"]  # required
+        yield keys["price"], str(good["price"])
+        yield keys["num"], str(good["num"])
+        for name in _GOOD_OPTIONAL:
+            if name in good:
+                yield keys[name], good[name]
+        for j, prop in enumerate(good.get("props", ())):
+            yield _good_sub_key(i, "props", j, "key"), prop["key"]
+            yield _good_sub_key(i, "props", j, "value"), prop["value"]
+        for j, opt in enumerate(good.get("option", ())):
+            yield _good_sub_key(i, "option", j, "name"), opt["name"]
+            yield _good_sub_key(i, "option", j, "num"), str(opt["num"])
+        for j, tag in enumerate(good.get("tags", ())):
+            yield _good_sub_key(i, "tags", j, "type"), tag["type"]
+            yield _good_sub_key(i, "tags", j, "no"), tag["no"]
+            if "goods_no" in tag:
+                yield _good_sub_key(i, "tags", j, "goods_no"), tag["goods_no"]
 
 
 def create_order(
@@ -37,62 +111,71 @@ def create_order(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or CREATE_ORDER_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-
-    files: Dict[str, Any] = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "purchase_order": (None, purchase_order),
-        "status": (None, status),
+    fields: Dict[str, Any] = {
+        "purchase_order": purchase_order,
+        "status": status,
     }
 
     if logistics_id is not None:
-        files["logistics_id"] = (None, logistics_id)
+        fields["logistics_id"] = logistics_id
     if remark is not None:
-        files["remark"] = (None, remark)
+        fields["remark"] = remark
 
-    for i, good in enumerate(goods):
-        prefix = f"goods[{i}]"
-        files[f"{prefix}[link]"] = (None, good["link"])  # required
-        files[f"{prefix}[price]"] = (None, str(good["price"]))
-        files[f"{prefix}[num]"] = (None, str(good["num"]))
-        if "pic" in good:
-            files[f"{prefix}[pic]"] = (None, good["pic"]) 
-        if "remark" in good:
-            files[f"{prefix}[remark]"] = (None, good["remark"]) 
-        if "fba" in good:
-            files[f"{prefix}[fba]"] = (None, good["fba"]) 
-        if "asin" in good:
-            files[f"{prefix}[asin]"] = (None, good["asin"]) 
-        if "props" in good:
-            for j, prop in enumerate(good["props"]):
-                files[f"{prefix}[props][{j}][key]"] = (None, prop["key"]) 
-                files[f"{prefix}[props][{j}][value]"] = (None, prop["value"]) 
-        if "option" in good:
-            for j, opt in enumerate(good["option"]):
-                files[f"{prefix}[option][{j}][name]"] = (None, opt["name"]) 
-                files[f"{prefix}[option][{j}][num]"] = (None, str(opt["num"])) 
-        if "tags" in good:
-            for j, tag in enumerate(good["tags"]):
-                files[f"{prefix}[tags][{j}][type]"] = (None, tag["type"]) 
-                files[f"{prefix}[tags][{j}][no]"] = (None, tag["no"]) 
-                if "goods_no" in tag:
-                    files[f"{prefix}[tags][{j}][goods_no]"] = (None, tag["goods_no"]) 
-
-    data = safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
-    if data is None:
-        return None
-
-    if not data.get("success", False):
-        print(" Create order API failed:", data)
-        return None
-    return data.get("data")
+    fields.update(_iter_goods_fields(goods))
+
+    data = _mutating_call(
+        api_url or CREATE_ORDER_API_URL,
+        fields,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
+    return api_result(data, "create order API", "data")
+
+
+_BULK_ORDER_KEYS = frozenset({"purchase_order", "status", "goods", "logistics_id", "remark"})
+_BULK_ORDER_REQUIRED = ("purchase_order", "status", "goods")
+
+
+def create_orders_bulk(
+    orders: List[dict],
+    request_timeout_seconds: int = 15,
+    max_concurrency: int = 4,
+    **kwargs: Any,
+) -> List[Optional[dict]]:
+    """
+    Create several orders concurrently. Each entry is a dict with purchase_order,
+    status and goods, and optionally logistics_id and remark (as for create_order);
+    extra kwargs (credentials, api_url, session) apply to all. Entries are checked
+    before anything is sent, so a bad key raises ValueError with no order created.
+    Results come back in input order, None where that creation failed (including
+    errors raised while sending it); the other orders are still returned.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    for i, order in enumerate(orders):
+        unknown = sorted(set(order) - _BULK_ORDER_KEYS)
+        missing = [key for key in _BULK_ORDER_REQUIRED if key not in order]
+        if unknown:
+            raise ValueError(f"orders[{i}]: unknown keys {unknown}")
+        if missing:
+            raise ValueError(f"orders[{i}]: missing keys {missing}")
+    if not orders:
+        return []
+
+    def create(order: dict) -> Optional[dict]:
+        try:
+            return create_order(**order, request_timeout_seconds=request_timeout_seconds, **kwargs)
+        except Exception as exc:
+            logger.warning(" Create order %s failed: %s", order.get("purchase_order"), exc)
+            return None
+
+    workers = max(1, min(max_concurrency, len(orders)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(create, orders))
 
 
 def update_order_status(
@@ -102,20 +185,19 @@ def update_order_status(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or UPDATE_ORDER_STATUS_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "order_sn": (None, order_sn),
-        "status": (None, status),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return _mutating_call(
+        api_url or UPDATE_ORDER_STATUS_API_URL,
+        {
+            "order_sn": order_sn,
+            "status": status,
+        },
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
 
 
 def cancel_order(
@@ -124,19 +206,16 @@ def cancel_order(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or CANCEL_ORDER_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "order_sn": (None, order_sn),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return _mutating_call(
+        api_url or CANCEL_ORDER_API_URL,
+        {"order_sn": order_sn},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
 
 
 def get_order_list(
@@ -146,20 +225,50 @@ def get_order_list(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or ORDER_LIST_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "page": (None, str(page)),
-        "pageSize": (None, str(page_size)),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return api_call(
+        api_url or ORDER_LIST_API_URL,
+        {
+            "page": str(page),
+            "pageSize": str(page_size),
+        },
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+
+
+def iter_order_list(
+    page: int = 1,
+    page_size: int = 10,
+    request_timeout_seconds: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    api_url: Optional[str] = None,
+    items_path: str = "data.data",
+    session: Optional["requests.Session"] = None,
+) -> Iterator[dict]:
+    """
+    Yield the orders of one orderList page as they are parsed from the response
+    (streamed when ijson is installed). `items_path` locates the array in the body.
+    """
+    return iter_api_items(
+        api_url or ORDER_LIST_API_URL,
+        items_path,
+        {
+            "page": str(page),
+            "pageSize": str(page_size),
+        },
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        label="order list API",
+    )
 
 
 def get_order_detail(
@@ -168,19 +277,32 @@ def get_order_detail(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or ORDER_DETAIL_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "order_sn": (None, order_sn),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return api_call(
+        api_url or ORDER_DETAIL_API_URL,
+        {"order_sn": order_sn},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+
+
+def get_order_details_bulk(
+    order_sns: List[str],
+    request_timeout_seconds: int = 15,
+    max_concurrency: int = 8,
+    **kwargs: Any,
+) -> Dict[str, Optional[dict]]:
+    """Fetch several order details concurrently; returns {order_sn: response} in input order."""
+    return map_concurrent(
+        lambda order_sn: get_order_detail(order_sn, request_timeout_seconds=request_timeout_seconds, **kwargs),
+        order_sns,
+        max_workers=max_concurrency,
+    )
 
 
 def get_stock_list(
@@ -188,18 +310,37 @@ def get_stock_list(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or STOCK_LIST_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return api_call(
+        api_url or STOCK_LIST_API_URL,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+
+
+def iter_stock_list(
+    request_timeout_seconds: int = 15,
+    app_key: Optional[str] = None,
+    app_secret: Optional[str] = None,
+    api_url: Optional[str] = None,
+    items_path: str = "data",
+    session: Optional["requests.Session"] = None,
+) -> Iterator[dict]:
+    """Yield stockList entries as they are parsed; see iter_order_list."""
+    return iter_api_items(
+        api_url or STOCK_LIST_API_URL,
+        items_path,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        label="stock list API",
+    )
 
 
 def create_porder(
@@ -214,60 +355,61 @@ def create_porder(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or CREATE_PORDER_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files: Dict[str, Any] = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "status": (None, status),
-        "logistics_id": (None, logistics_id),
+    fields: Dict[str, Any] = {
+        "status": status,
+        "logistics_id": logistics_id,
     }
+    files: Dict[str, Any] = {}
     if client_remark:
-        files["client_remark"] = (None, client_remark)
+        fields["client_remark"] = client_remark
     for i, item in enumerate(porder_detail):
         prefix = f"porder_detail[{i}]"
-        files[f"{prefix}[order_sn]"] = (None, item["order_sn"]) 
+        fields[f"{prefix}[order_sn]"] = item["order_sn"]
         if "sorting" in item:
-            files[f"{prefix}[sorting]"] = (None, str(item["sorting"])) 
-        files[f"{prefix}[num]"] = (None, str(item["num"])) 
+            fields[f"{prefix}[sorting]"] = str(item["sorting"])
+        fields[f"{prefix}[num]"] = str(item["num"])
         if "client_remark" in item:
-            files[f"{prefix}[client_remark]"] = (None, item["client_remark"]) 
+            fields[f"{prefix}[client_remark]"] = item["client_remark"]
         if "porder_detail_tag" in item:
             for j, tag in enumerate(item["porder_detail_tag"]):
                 tprefix = f"{prefix}[porder_detail_tag][{j}]"
                 for key in ["type", "no", "goods_no", "text_line_one", "text_line_two"]:
                     if key in tag:
-                        files[f"{tprefix}[{key}]"] = (None, str(tag[key])) 
+                        fields[f"{tprefix}[{key}]"] = str(tag[key])
     if isinstance(receiver_address, dict):
         for key, value in receiver_address.items():
-            files[f"receiver_address[{key}]"] = (None, str(value)) 
+            fields[f"receiver_address[{key}]"] = str(value)
     if isinstance(importer_address, dict):
         for key, value in importer_address.items():
-            files[f"importer_address[{key}]"] = (None, str(value)) 
-    if porder_file:
-        for i, pf in enumerate(porder_file):
-            fprefix = f"porder_file[{i}]"
-            if "name" in pf:
-                files[f"{fprefix}[name]"] = (None, pf["name"]) 
-            if "file" in pf and pf["file"]:
-                try:
-                    files[f"{fprefix}[file]"] = (os.path.basename(pf["file"]), open(pf["file"], "rb"))
-                except Exception:
-                    files[f"{fprefix}[file]"] = (None, pf["file"]) 
-    try:
-        data = safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
-    finally:
-        for key, val in list(files.items()):
-            if isinstance(val, tuple) and len(val) == 2 and hasattr(val[1], "close"):
-                try:
-                    val[1].close()
-                except Exception:
-                    pass
+            fields[f"importer_address[{key}]"] = str(value)
+    with contextlib.ExitStack() as stack:
+        # The stack closes every opened part even if a later open() or the
+        # request itself fails.
+        if porder_file:
+            for i, pf in enumerate(porder_file):
+                fprefix = f"porder_file[{i}]"
+                if "name" in pf:
+                    fields[f"{fprefix}[name]"] = pf["name"]
+                if "file" in pf and pf["file"]:
+                    try:
+                        files[f"{fprefix}[file]"] = (
+                            os.path.basename(pf["file"]),
+                            stack.enter_context(open(pf["file"], "rb")),
+                            "application/octet-stream",
+                        )
+                    except Exception:
+                        fields[f"{fprefix}[file]"] = pf["file"]
+        data = _mutating_call(
+            api_url or CREATE_PORDER_API_URL,
+            fields,
+            files=files,
+            timeout=request_timeout_seconds,
+            app_key=app_key,
+            app_secret=app_secret,
+            session=session,
+        )
     return data
 
 
@@ -278,20 +420,19 @@ def update_porder_status(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or UPDATE_PORDER_STATUS_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "porder_sn": (None, porder_sn),
-        "status": (None, status),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return _mutating_call(
+        api_url or UPDATE_PORDER_STATUS_API_URL,
+        {
+            "porder_sn": porder_sn,
+            "status": status,
+        },
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
 
 
 def cancel_porder(
@@ -300,19 +441,16 @@ def cancel_porder(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or CANCEL_PORDER_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "porder_sn": (None, porder_sn),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return _mutating_call(
+        api_url or CANCEL_PORDER_API_URL,
+        {"porder_sn": porder_sn},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+    )
 
 
 def get_porder_list(
@@ -323,22 +461,24 @@ def get_porder_list(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or PORDER_LIST_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "page": (None, str(page)),
-        "pageSize": (None, str(page_size)),
+    fields: Dict[str, Any] = {
+        "page": str(page),
+        "pageSize": str(page_size),
     }
     if porder_sn:
-        files["porder_sn"] = (None, porder_sn)
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+        fields["porder_sn"] = porder_sn
+    return api_call(
+        api_url or PORDER_LIST_API_URL,
+        fields,
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
 
 
 def get_porder_detail(
@@ -347,19 +487,32 @@ def get_porder_detail(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or PORDER_DETAIL_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "porder_sn": (None, porder_sn),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return api_call(
+        api_url or PORDER_DETAIL_API_URL,
+        {"porder_sn": porder_sn},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
+
+
+def get_porder_details_bulk(
+    porder_sns: List[str],
+    request_timeout_seconds: int = 15,
+    max_concurrency: int = 8,
+    **kwargs: Any,
+) -> Dict[str, Optional[dict]]:
+    """Fetch several porder details concurrently; returns {porder_sn: response} in input order."""
+    return map_concurrent(
+        lambda porder_sn: get_porder_detail(porder_sn, request_timeout_seconds=request_timeout_seconds, **kwargs),
+        porder_sns,
+        max_workers=max_concurrency,
+    )
 
 
 def get_logistics_track(
@@ -368,18 +521,17 @@ def get_logistics_track(
     app_key: Optional[str] = None,
     app_secret: Optional[str] = None,
     api_url: Optional[str] = None,
+    cache_ttl: float = 0,
+    session: Optional["requests.Session"] = None,
 ) -> Optional[dict]:
-    timestamp = str(int(time.time()))
-    resolved_app_key = app_key or APP_KEY
-    resolved_app_secret = app_secret or APP_SECRET
-    resolved_api_url = api_url or LOGISTICS_TRACK_API_URL
-    sign = generate_sign(resolved_app_key, resolved_app_secret, timestamp)
-    files = {
-        "app_key": (None, resolved_app_key),
-        "timestamp": (None, timestamp),
-        "sign": (None, sign),
-        "express_no": (None, express_no),
-    }
-    return safe_post_json(resolved_api_url, files=files, timeout=request_timeout_seconds)
+    return api_call(
+        api_url or LOGISTICS_TRACK_API_URL,
+        {"express_no": express_no},
+        timeout=request_timeout_seconds,
+        app_key=app_key,
+        app_secret=app_secret,
+        session=session,
+        cache_ttl=cache_ttl,
+    )
 
 
@@ -1,9 +1,33 @@
+import codecs
 import json
+import sys
+from typing import Callable, Optional
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def json_dumps_pretty(obj) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Unsupported types (e.g. >64-bit ints); let stdlib handle them
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2)
 
 
 def json_print(obj) -> None:
     try:
-        print(json.dumps(obj, ensure_ascii=False, indent=2))
+        # Serialise straight to bytes and write them in one go on UTF-8 consoles
+        _write_stdout(
+            _dumps_bytes(obj, False) + b"\n",
+            lambda: json.dumps(obj, ensure_ascii=True, indent=2) + "\n",
+        )
+    except BrokenPipeError:
+        raise
     except Exception:
         try:
             print(json.dumps(obj, ensure_ascii=True, indent=2))
@@ -11,7 +35,70 @@ def json_print(obj) -> None:
             print(str(obj))
 
 
-def print_error(message: str) -> None:
-    print(f" {message}")
+def _dumps_bytes(obj, compact: bool) -> bytes:
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    return _dumps_text(obj, compact, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_text(obj, compact: bool, ensure_ascii: bool) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=ensure_ascii, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=ensure_ascii, indent=2)
+
+
+def json_print_many(objs, compact: bool = False) -> None:
+    """
+    Print each object as JSON (one block per object, or one line each when compact)
+    with a single write to stdout instead of one print per object.
+    """
+    if not objs:
+        return
+    _write_stdout(
+        b"\n".join(_dumps_bytes(o, compact) for o in objs) + b"\n",
+        lambda: "\n".join(_dumps_text(o, compact, ensure_ascii=True) for o in objs) + "\n",
+    )
 
 
+def _stdout_is_utf8() -> bool:
+    try:
+        return codecs.lookup(sys.stdout.encoding or "").name == "utf-8"
+    except (LookupError, AttributeError):
+        return False
+
+
+def _write_stdout(out: bytes, ascii_fallback: Optional[Callable[[], str]] = None) -> None:
+    """
+    Write UTF-8 JSON to stdout. The bytes go straight to the buffer only when the
+    console is UTF-8; otherwise (e.g. cp932 on Windows) they go through the text
+    layer, and text it cannot encode is replaced by `ascii_fallback()` when given.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None and _stdout_is_utf8():
+        sys.stdout.flush()
+        buffer.write(out)
+        buffer.flush()
+        return
+    try:
+        sys.stdout.write(out.decode("utf-8"))
+    except UnicodeEncodeError:
+        if ascii_fallback is None:
+            raise
+        sys.stdout.write(ascii_fallback())
+
+
+def json_print_array(objs, compact: bool = False) -> None:
+    """Print all objects as a single JSON array, serialised and written at once."""
+    objs = list(objs)
+    _write_stdout(
+        _dumps_bytes(objs, compact) + b"\n",
+        lambda: _dumps_text(objs, compact, ensure_ascii=True) + "\n",
+    )
+
+
+def print_error(message: str) -> None:
+    print(f" {message}")
@@ -1,15 +1,51 @@
+import functools
 import hashlib
 import hmac
+import time
+from typing import Dict, Tuple
+
+
+@functools.lru_cache(maxsize=8)
+def _creds_prefix(app_key: str, app_secret: str) -> bytes:
+    return (app_key + app_secret).encode("utf-8")
 
 
 def md5_sign(app_key: str, app_secret: str, timestamp: str) -> str:
-    raw = (app_key + app_secret + timestamp).encode("utf-8")
-    return hashlib.md5(raw).hexdigest()
+    # The sign is a request tag, not a security primitive; opting out of the
+    # FIPS-checked constructor keeps OpenSSL 3 builds on the fast path.
+    h = hashlib.md5(usedforsecurity=False)
+    h.update(_creds_prefix(app_key, app_secret))
+    # Timestamps are plain digits, so ASCII is the cheapest encode
+    h.update(timestamp.encode("ascii"))
+    return h.hexdigest()
+
+
+# A timestamp/sign pair stays valid well within the API's clock-skew window,
+# so a burst of read-only calls (a search and the detail fetches that follow it)
+# shares one instead of re-signing every request. Keyed by credentials; refreshed
+# after 60s. Calls that change state pass reuse=False and always sign afresh.
+_SIGN_REUSE_SECONDS = 60
+_SIGNED_PARAMS: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+
+
+def signed_params(app_key: str, app_secret: str, reuse: bool = True) -> Tuple[str, str]:
+    """
+    Return (timestamp, md5 sign) for the credentials. With reuse, a pair issued in the
+    last 60s is returned instead of a fresh one.
+    """
+    now = time.time()
+    timestamp = str(int(now))
+    if reuse:
+        cached = _SIGNED_PARAMS.get((app_key, app_secret))
+        if cached is not None and now - cached[0] < _SIGN_REUSE_SECONDS:
+            return cached[1], cached[2]
+    sign = md5_sign(app_key, app_secret, timestamp)
+    if reuse:
+        _SIGNED_PARAMS[(app_key, app_secret)] = (now, timestamp, sign)
+    return timestamp, sign
 
 
 def hmac_sha256_sign(app_key: str, app_secret: str, timestamp: str) -> str:
     message = (app_key + timestamp).encode("utf-8")
     secret = app_secret.encode("utf-8")
     return hmac.new(secret, message, hashlib.sha256).hexdigest()
-
-
@@ -1,4 +1,19 @@
 from typing import Optional, Dict, Any
+import re
+
+# Everything but digits and decimal separators, e.g. the currency in "¥12.5"
+_NON_NUMERIC_RE = re.compile(r'[^\d.,]')
+_PRICE_FIELDS = ("goodsPrice", "price", "productPrice", "salePrice", "marketPrice")
+
+
+def dig(data: Any, *keys: str, default: Any = None) -> Any:
+    """Walk nested dicts by `keys`; return `default` as soon as a level is missing or not a dict."""
+    cur = data
+    for key in keys:
+        if not isinstance(cur, dict) or key not in cur:
+            return default
+        cur = cur[key]
+    return cur
 
 
 def convert_rmb_to_jpy(rmb_price: float, exchange_rate: float = 20.0) -> float:
@@ -13,15 +28,13 @@ def convert_jpy_to_rmb(jpy_price: float, exchange_rate: float = 20.0) -> float:
 
 def get_product_price_in_jpy(product: Dict[str, Any], exchange_rate: float = 20.0) -> Optional[float]:
     """Extract and convert product price to JPY. Returns None if unavailable."""
-    price_fields = ["goodsPrice", "price", "productPrice", "salePrice", "marketPrice"]
-    for field in price_fields:
+    for field in _PRICE_FIELDS:
         price = product.get(field)
         if price is None:
             continue
         try:
             if isinstance(price, str):
-                import re
-                price_clean = re.sub(r'[^\d.,]', '', price)
+                price_clean = _NON_NUMERIC_RE.sub('', price)
                 if not price_clean:
                     continue
                 price_clean = price_clean.replace(',', '.')